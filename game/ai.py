@@ -3,31 +3,38 @@ import random
 from game.constants import WINDOW_HEIGHT, PADDLE_HEIGHT, AI_DIFFICULTY_LEVELS
 
 class AI:
-    def __init__(self, difficulty: str = "MEDIUM"):
-        """Initialize AI with specified difficulty level"""
+    def __init__(self, difficulty: str = "MEDIUM", reaction_delay: int = None,
+                 prediction_accuracy: float = None, speed: int = None,
+                 rng: random.Random = None):
+        """
+        Initialize AI with specified difficulty level.
+        Explicit parameters override the difficulty preset.
+        """
         self.difficulty = difficulty
-        self.reaction_delay = self._get_reaction_delay()
-        self.prediction_accuracy = self._get_prediction_accuracy()
+        self.rng = rng or random
+        self.reaction_delay = (self._get_reaction_delay() if reaction_delay is None
+                               else reaction_delay)
+        self.prediction_accuracy = (self._get_prediction_accuracy() if prediction_accuracy is None
+                                    else prediction_accuracy)
+        self.speed = self._get_speed() if speed is None else speed
         self.frames_since_decision = 0
         self.target_y = WINDOW_HEIGHT // 2
 
+    def _get_level(self) -> dict:
+        """Get the preset for the current difficulty"""
+        return AI_DIFFICULTY_LEVELS.get(self.difficulty, AI_DIFFICULTY_LEVELS["MEDIUM"])
+
     def _get_reaction_delay(self) -> int:
         """Get reaction delay based on difficulty"""
-        delays = {
-            "EASY": 30,
-            "MEDIUM": 15,
-            "HARD": 5
-        }
-        return delays.get(self.difficulty, 15)
+        return self._get_level()["reaction_delay"]
 
     def _get_prediction_accuracy(self) -> float:
         """Get prediction accuracy based on difficulty"""
-        accuracies = {
-            "EASY": 0.6,
-            "MEDIUM": 0.8,
-            "HARD": 0.95
-        }
-        return accuracies.get(self.difficulty, 0.8)
+        return self._get_level()["prediction_accuracy"]
+
+    def _get_speed(self) -> int:
+        """Get paddle speed based on difficulty"""
+        return self._get_level()["speed"]
 
     def calculate_move(self, paddle_y: float, ball_pos: Tuple[float, float], 
                       ball_speed: Tuple[float, float]) -> int:
@@ -48,8 +55,8 @@ class AI:
         self.frames_since_decision = 0
 
         # Add randomness based on difficulty
-        if random.random() > self.prediction_accuracy:
-            self.target_y = ball_y + random.randint(-50, 50)
+        if self.rng.random() > self.prediction_accuracy:
+            self.target_y = ball_y + self.rng.randint(-50, 50)
         else:
             # Predict ball position
             if speed_x > 0:  # Ball moving towards AI
@@ -83,4 +90,5 @@ class AI:
             self.difficulty = new_difficulty
             self.reaction_delay = self._get_reaction_delay()
             self.prediction_accuracy = self._get_prediction_accuracy()
+            self.speed = self._get_speed()
             self.frames_since_decision = 0
\ No newline at end of file
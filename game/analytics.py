@@ -0,0 +1,231 @@
+import argparse
+import bisect
+import gzip
+import json
+import os
+from collections import Counter
+from concurrent.futures import FIRST_COMPLETED, ProcessPoolExecutor, wait
+from typing import Dict, Iterable, Iterator, List, Optional
+from .timing import RunningStats
+
+# Fixed histogram layouts
+RALLY_BINS = 50              # One bin per rally length, the last one open-ended
+INTERSECT_BINS = 20          # Over the normalized paddle intersect, -1..1
+SPEED_CURVE_HITS = 64        # Hits per rally tracked by the speed growth curve
+DIGEST_COMPRESSION = 100
+
+
+class Histogram:
+    def __init__(self, low: float, high: float, bins: int):
+        """Fixed-bin histogram; values outside the range go to the edge bins"""
+        self.low = low
+        self.high = high
+        self.counts = [0] * bins
+
+    def add(self, value: float) -> None:
+        """Count a value"""
+        bins = len(self.counts)
+        index = int((value - self.low) / (self.high - self.low) * bins)
+        self.counts[min(max(index, 0), bins - 1)] += 1
+
+    def merge(self, other: "Histogram") -> None:
+        """Add the counts of a histogram with the same layout"""
+        self.counts = [a + b for a, b in zip(self.counts, other.counts)]
+
+
+class QuantileDigest:
+    def __init__(self, compression: int = DIGEST_COMPRESSION):
+        """
+        Merging t-digest: approximate quantiles from a bounded number of
+        weighted centroids, with better resolution near the tails
+        """
+        self.compression = compression
+        self.means: List[float] = []
+        self.weights: List[float] = []
+        self.buffer: List[float] = []
+        self.total = 0.0
+
+    def add(self, value: float) -> None:
+        """Add a value; centroids are rebuilt when the buffer fills up"""
+        self.buffer.append(value)
+        if len(self.buffer) >= self.compression * 5:
+            self._compress()
+
+    def merge(self, other: "QuantileDigest") -> None:
+        """Fold the centroids of another digest into this one"""
+        other._compress()
+        self._compress()
+        self._compress(list(zip(other.means, other.weights)))
+
+    def quantile(self, q: float) -> float:
+        """Estimate the value at quantile q (0..1)"""
+        self._compress()
+        if not self.means:
+            return 0.0
+        if len(self.means) == 1:
+            return self.means[0]
+
+        # Interpolate between centroid centers
+        target = q * self.total
+        cumulative = 0.0
+        centers = []
+        for weight in self.weights:
+            centers.append(cumulative + weight / 2)
+            cumulative += weight
+        index = bisect.bisect_left(centers, target)
+        if index == 0:
+            return self.means[0]
+        if index == len(centers):
+            return self.means[-1]
+        span = centers[index] - centers[index - 1]
+        fraction = (target - centers[index - 1]) / span
+        return self.means[index - 1] + fraction * (self.means[index] - self.means[index - 1])
+
+    def _compress(self, extra: Optional[List] = None) -> None:
+        """Merge buffered values and centroids under the size bound"""
+        if not self.buffer and not extra:
+            return
+        points = list(zip(self.means, self.weights))
+        points.extend((value, 1.0) for value in self.buffer)
+        if extra:
+            points.extend(extra)
+        points.sort()
+        self.buffer = []
+        self.total = sum(weight for _, weight in points)
+
+        means: List[float] = []
+        weights: List[float] = []
+        cumulative = 0.0
+        for mean, weight in points:
+            if weights:
+                q = (cumulative + (weights[-1] + weight) / 2) / self.total
+                # Clamping the tails keeps the centroid count independent
+                # of how many values were added
+                tail = max(q * (1 - q), 1 / self.compression)
+                limit = 4 * self.total * tail / self.compression
+                if weights[-1] + weight <= limit:
+                    merged = weights[-1] + weight
+                    means[-1] += (mean - means[-1]) * weight / merged
+                    weights[-1] = merged
+                    continue
+                cumulative += weights[-1]
+            means.append(mean)
+            weights.append(weight)
+        self.means = means
+        self.weights = weights
+
+
+class MatchAnalytics:
+    def __init__(self):
+        """Fixed-memory aggregates over any number of match event streams"""
+        self.matches = 0
+        self.points = 0
+        self.rally_lengths = Histogram(0, RALLY_BINS, RALLY_BINS)
+        self.rally_moments = RunningStats()
+        self.rally_quantiles = QuantileDigest()
+        self.hit_positions = Histogram(-1.0, 1.0, INTERSECT_BINS)
+        self.speed_curve = [RunningStats() for _ in range(SPEED_CURVE_HITS)]
+        self.point_causes: Counter = Counter()
+        self.hits_this_rally = 0
+
+    def add_event(self, event: Dict) -> None:
+        """Update the aggregates with a single event"""
+        kind = event["event"]
+        if kind == "serve":
+            self.hits_this_rally = 0
+        elif kind == "hit":
+            self.hit_positions.add(event["intersect"])
+            if self.hits_this_rally < SPEED_CURVE_HITS:
+                self.speed_curve[self.hits_this_rally].add(event["speed"])
+            self.hits_this_rally += 1
+        elif kind == "point":
+            self.points += 1
+            self.rally_lengths.add(event["rally"])
+            self.rally_moments.add(event["rally"])
+            self.rally_quantiles.add(event["rally"])
+            self.point_causes[event["cause"]] += 1
+        elif kind == "end":
+            self.matches += 1
+
+    def add_events(self, events: Iterable[Dict]) -> None:
+        """Consume an event stream"""
+        for event in events:
+            self.add_event(event)
+
+    def merge(self, other: "MatchAnalytics") -> None:
+        """Combine with aggregates computed elsewhere"""
+        self.matches += other.matches
+        self.points += other.points
+        self.rally_lengths.merge(other.rally_lengths)
+        self.rally_moments.merge(other.rally_moments)
+        self.rally_quantiles.merge(other.rally_quantiles)
+        self.hit_positions.merge(other.hit_positions)
+        for mine, theirs in zip(self.speed_curve, other.speed_curve):
+            mine.merge(theirs)
+        self.point_causes.update(other.point_causes)
+
+    def summary(self) -> Dict:
+        """Get the aggregates as plain data"""
+        return {
+            "matches": self.matches,
+            "points": self.points,
+            "rally_length": {
+                "mean": self.rally_moments.mean,
+                "stddev": self.rally_moments.stddev,
+                "max": self.rally_moments.max,
+                "p50": self.rally_quantiles.quantile(0.5),
+                "p90": self.rally_quantiles.quantile(0.9),
+                "p99": self.rally_quantiles.quantile(0.99),
+                "histogram": self.rally_lengths.counts,
+            },
+            "hit_position_histogram": self.hit_positions.counts,
+            "ball_speed_by_hit": [round(stats.mean, 3) for stats in self.speed_curve
+                                  if stats.count],
+            "point_causes": dict(self.point_causes),
+        }
+
+
+def read_events(filename: str) -> Iterator[Dict]:
+    """Stream events from a JSON lines file written by MatchRecorder"""
+    opener = gzip.open if filename.endswith(".gz") else open
+    with opener(filename, "rt") as f:
+        for line in f:
+            if line.strip():
+                yield json.loads(line)
+
+
+def analyze_file(filename: str) -> MatchAnalytics:
+    """Aggregate a single recording"""
+    analytics = MatchAnalytics()
+    analytics.add_events(read_events(filename))
+    return analytics
+
+
+def analyze_files(filenames: Iterable[str], processes: Optional[int] = None) -> MatchAnalytics:
+    """
+    Aggregate recordings in parallel and merge the partial results as they
+    complete. At most two files per worker are in flight, so memory does not
+    grow with the number of files.
+    """
+    total = MatchAnalytics()
+    max_in_flight = 2 * (processes or os.cpu_count() or 1)
+    with ProcessPoolExecutor(max_workers=processes) as executor:
+        pending = set()
+        for filename in filenames:
+            if len(pending) >= max_in_flight:
+                done, pending = wait(pending, return_when=FIRST_COMPLETED)
+                for future in done:
+                    total.merge(future.result())
+            pending.add(executor.submit(analyze_file, filename))
+        for future in wait(pending).done:
+            total.merge(future.result())
+    return total
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Aggregate recorded LollmsPong matches")
+    parser.add_argument("files", nargs="+", help="JSON lines recordings (optionally .gz)")
+    parser.add_argument("--processes", type=int, default=None)
+    args = parser.parse_args()
+
+    print(json.dumps(analyze_files(args.files, args.processes).summary(), indent=4))
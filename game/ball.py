@@ -1,4 +1,5 @@
 import pygame
+import math
 import random
 from .constants import WINDOW_WIDTH, WINDOW_HEIGHT, BALL_SIZE, BALL_SPEED, WHITE
 
@@ -6,17 +7,19 @@ class Ball:
     def __init__(self):
         """Initialize the ball with starting position and random direction"""
         self.size = BALL_SIZE
+        self.last_intersect = 0.0
         self.reset()
         
-    def reset(self):
+    def reset(self, rng: random.Random = None):
         """Reset ball to center position with random direction"""
+        rng = rng or random
         self.x = WINDOW_WIDTH // 2
         self.y = WINDOW_HEIGHT // 2
         
         # Random angle between -45 and 45 degrees for initial direction
-        angle = random.uniform(-45, 45)
-        self.speed_x = BALL_SPEED * (1 if random.random() > 0.5 else -1)
-        self.speed_y = random.uniform(-BALL_SPEED, BALL_SPEED)
+        angle = rng.uniform(-45, 45)
+        self.speed_x = BALL_SPEED * (1 if rng.random() > 0.5 else -1)
+        self.speed_y = rng.uniform(-BALL_SPEED, BALL_SPEED)
 
     def move(self):
         """Update ball position and handle wall collisions"""
@@ -43,6 +46,7 @@ class Ball:
             # Calculate relative collision position for varying bounce angle
             relative_intersect_y = (paddle.y + paddle.height/2) - (self.y + self.size/2)
             normalized_intersect = relative_intersect_y / (paddle.height/2)
+            self.last_intersect = normalized_intersect
             bounce_angle = normalized_intersect * 60  # Max 60 degree bounce
             
             # Adjust vertical speed based on collision point
@@ -0,0 +1,194 @@
+import argparse
+import itertools
+import json
+import os
+import random
+import sys
+from concurrent.futures import ProcessPoolExecutor
+from typing import Dict, List, Optional, Tuple
+from .constants import PHYSICS_FIXED
+from .ai import AI
+from .match import Match
+
+# A configuration is (reaction_delay, prediction_accuracy, speed)
+Config = Tuple[int, float, int]
+
+# Search grid
+REACTION_DELAYS = (2, 5, 10, 15, 20, 30, 45)
+PREDICTION_ACCURACIES = (0.5, 0.6, 0.7, 0.8, 0.9, 0.95, 1.0)
+PADDLE_SPEEDS = (4, 5, 6, 7, 8)
+
+# Opponents every configuration is measured against
+REFERENCE_OPPONENTS: Tuple[Config, ...] = ((15, 0.8, 6), (5, 0.95, 7))
+
+# Win rates each difficulty should reach against the references
+TARGET_WIN_RATES = {
+    "EASY": 0.2,
+    "MEDIUM": 0.5,
+    "HARD": 0.8,
+}
+
+# Successive halving: matches per configuration in the first round,
+# doubled every round while only the closest configurations survive
+INITIAL_MATCHES = 8
+ROUNDS = 4
+SURVIVORS_PER_TARGET = 8
+
+# Win rates further than this from their target are reported as missed
+TARGET_TOLERANCE = 0.05
+
+CACHE_FILE = "calibration_cache.json"
+# Bump whenever match results would change (physics, seat assignment, ...)
+CACHE_VERSION = 2
+
+
+def play_matches(config: Config, reference: Config, start: int, count: int) -> int:
+    """
+    Play matches start..start+count-1 of config against reference.
+    Each match index has its own seed and fixed-point physics, so a result
+    never changes and can be cached. The AI is not symmetric between the
+    two sides, so config plays on the right for even indices and on the
+    left for odd ones.
+    Returns: number of matches won by config
+    """
+    wins = 0
+    for index in range(start, start + count):
+        rng = random.Random(index)
+        candidate = AI(reaction_delay=config[0], prediction_accuracy=config[1],
+                       speed=config[2], rng=random.Random(rng.getrandbits(32)))
+        opponent = AI(reaction_delay=reference[0], prediction_accuracy=reference[1],
+                      speed=reference[2], rng=random.Random(rng.getrandbits(32)))
+        seed = rng.getrandbits(32)
+        if index % 2 == 0:
+            match, seat = Match(opponent, candidate, seed=seed, physics=PHYSICS_FIXED), 2
+        else:
+            match, seat = Match(candidate, opponent, seed=seed, physics=PHYSICS_FIXED), 1
+        if match.run() == seat:
+            wins += 1
+    return wins
+
+
+class Calibrator:
+    def __init__(self, cache_file: str = CACHE_FILE, processes: Optional[int] = None,
+                 references: Tuple[Config, ...] = REFERENCE_OPPONENTS):
+        """Evaluate AI configurations in parallel, caching results on disk"""
+        self.cache_file = cache_file
+        self.processes = processes
+        self.references = references
+        self.cache: Dict[str, Dict[str, int]] = {}
+        self.load_cache()
+
+    def load_cache(self) -> None:
+        """Load previously evaluated configurations"""
+        try:
+            if os.path.exists(self.cache_file):
+                with open(self.cache_file, 'r') as f:
+                    data = json.load(f)
+                # Results from an older version were measured differently
+                if data.get("version") == CACHE_VERSION:
+                    self.cache = data["results"]
+        except Exception as e:
+            print(f"Error loading calibration cache: {e}")
+            self.cache = {}
+
+    def save_cache(self) -> None:
+        """Save evaluated configurations"""
+        try:
+            with open(self.cache_file, 'w') as f:
+                json.dump({"version": CACHE_VERSION, "results": self.cache}, f)
+        except Exception as e:
+            print(f"Error saving calibration cache: {e}")
+
+    def _key(self, config: Config, reference: Config) -> str:
+        return json.dumps([config, reference])
+
+    def evaluate(self, configs: List[Config], matches: int) -> Dict[Config, float]:
+        """
+        Get the win rate of each configuration over matches games per reference.
+        Only games that are not cached yet are played.
+        """
+        jobs = []
+        for config in configs:
+            for reference in self.references:
+                played = self.cache.get(self._key(config, reference), {}).get("games", 0)
+                if played < matches:
+                    jobs.append((config, reference, played, matches - played))
+
+        if jobs:
+            with ProcessPoolExecutor(max_workers=self.processes) as executor:
+                results = executor.map(play_matches, *zip(*jobs), chunksize=4)
+                for (config, reference, start, count), wins in zip(jobs, results):
+                    entry = self.cache.setdefault(self._key(config, reference),
+                                                  {"games": 0, "wins": 0})
+                    entry["games"] = start + count
+                    entry["wins"] += wins
+            self.save_cache()
+
+        win_rates = {}
+        for config in configs:
+            entries = [self.cache[self._key(config, reference)] for reference in self.references]
+            win_rates[config] = (sum(e["wins"] for e in entries) /
+                                 sum(e["games"] for e in entries))
+        return win_rates
+
+    def calibrate(self, targets: Dict[str, float] = TARGET_WIN_RATES,
+                  initial_matches: int = INITIAL_MATCHES, rounds: int = ROUNDS,
+                  survivors: int = SURVIVORS_PER_TARGET) -> Dict[str, Dict]:
+        """
+        Search the grid with successive halving and pick, for each
+        difficulty, the configuration closest to its target win rate
+        """
+        candidates = list(itertools.product(REACTION_DELAYS, PREDICTION_ACCURACIES,
+                                            PADDLE_SPEEDS))
+        matches = initial_matches
+        for round_number in range(rounds):
+            win_rates = self.evaluate(candidates, matches)
+            print(f"Round {round_number + 1}: {len(candidates)} configurations, "
+                  f"{matches} matches per reference")
+
+            if round_number < rounds - 1:
+                keep = set()
+                for target in targets.values():
+                    ranked = sorted(candidates, key=lambda c: abs(win_rates[c] - target))
+                    keep.update(ranked[:survivors])
+                candidates = sorted(keep)
+                survivors = max(1, survivors // 2)
+                matches *= 2
+
+        presets = {}
+        for difficulty, target in targets.items():
+            best = min(candidates, key=lambda c: abs(win_rates[c] - target))
+            presets[difficulty] = {
+                "reaction_delay": best[0],
+                "prediction_accuracy": best[1],
+                "speed": best[2],
+                "win_rate": round(win_rates[best], 3),
+                "target": target,
+            }
+            if abs(win_rates[best] - target) > TARGET_TOLERANCE:
+                print(f"Warning: {difficulty} missed its target win rate {target:.2f}; "
+                      f"the closest configuration reaches {win_rates[best]:.3f}. "
+                      f"The search grid does not cover this difficulty.")
+        return presets
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Calibrate AI difficulty presets")
+    parser.add_argument("--processes", type=int, default=None)
+    parser.add_argument("--cache", default=CACHE_FILE)
+    parser.add_argument("--matches", type=int, default=INITIAL_MATCHES,
+                        help="matches per reference in the first round")
+    parser.add_argument("--rounds", type=int, default=ROUNDS)
+    parser.add_argument("--output", default=None, help="write presets to this JSON file")
+    args = parser.parse_args()
+
+    calibrator = Calibrator(args.cache, args.processes)
+    presets = calibrator.calibrate(initial_matches=args.matches, rounds=args.rounds)
+    print(json.dumps(presets, indent=4))
+    if args.output:
+        with open(args.output, 'w') as f:
+            json.dump(presets, f, indent=4)
+
+    # Fail so that scripts do not silently ship presets that missed their target
+    if any(abs(p["win_rate"] - p["target"]) > TARGET_TOLERANCE for p in presets.values()):
+        sys.exit(1)
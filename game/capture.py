@@ -0,0 +1,132 @@
+import io
+import os
+import queue
+import shutil
+import tempfile
+import threading
+import time
+from typing import Iterator, Optional, Tuple
+import pygame
+from PIL import Image
+from .constants import (WINDOW_WIDTH, WINDOW_HEIGHT, FPS, CAPTURE_BUFFERS, CAPTURE_FORMAT,
+                        CAPTURE_GIF_MAX_FRAMES)
+
+
+class FrameCapture:
+    def __init__(self, output_dir: str, fmt: str = CAPTURE_FORMAT,
+                 size: Tuple[int, int] = (WINDOW_WIDTH, WINDOW_HEIGHT),
+                 buffers: int = CAPTURE_BUFFERS, fps: int = FPS):
+        """
+        Record frames into a bounded ring of preallocated surfaces.
+        The game renders straight into a free buffer, so the game thread
+        never copies pixels; a background thread encodes them with Pillow.
+        fmt: 'png' for a numbered PNG sequence, 'gif' or 'webp' for an
+        animated file. Animated captures are streamed to a temporary PNG
+        sequence on disk while recording and assembled by the writer thread
+        after close(). WebP assembly encodes one frame at a time; Pillow
+        keeps every GIF frame until the file is written, so GIF captures are
+        limited to CAPTURE_GIF_MAX_FRAMES and later frames count as dropped.
+        """
+        if fmt not in ("png", "gif", "webp"):
+            raise ValueError(f"Unsupported capture format: {fmt}")
+
+        self.output_dir = output_dir
+        self.fmt = fmt
+        self.fps = fps
+        os.makedirs(output_dir, exist_ok=True)
+        self.frame_dir = output_dir if fmt == "png" else tempfile.mkdtemp(dir=output_dir)
+        self.output_path = os.path.join(output_dir,
+                                        time.strftime(f"capture_%Y%m%d_%H%M%S.{fmt}"))
+        self.max_frames = CAPTURE_GIF_MAX_FRAMES if fmt == "gif" else None
+
+        self.free: queue.Queue = queue.Queue()
+        self.filled: queue.Queue = queue.Queue()
+        for _ in range(buffers):
+            self.free.put(pygame.Surface(size).convert())
+
+        self.accepted = 0
+        self.written = 0
+        self.dropped = 0
+
+        self.thread = threading.Thread(target=self._write_frames, daemon=True)
+        self.thread.start()
+
+    def acquire(self) -> Optional[pygame.Surface]:
+        """
+        Get a free buffer to render the next frame into
+        Returns: None when the encoder has fallen behind or the capture is
+        full, and the frame is dropped
+        """
+        if self.max_frames is not None and self.accepted >= self.max_frames:
+            self.dropped += 1
+            return None
+        try:
+            surface = self.free.get_nowait()
+        except queue.Empty:
+            self.dropped += 1
+            return None
+        self.accepted += 1
+        return surface
+
+    def submit(self, surface: pygame.Surface) -> None:
+        """Hand a rendered buffer over to the writer thread"""
+        self.filled.put(surface)
+
+    def close(self, wait: bool = True) -> None:
+        """
+        Stop recording; the writer thread flushes pending frames and then
+        assembles the animated file, if any
+        wait: block until that is done, otherwise return immediately
+        """
+        self.filled.put(None)
+        if wait:
+            self.join()
+
+    def join(self) -> None:
+        """Wait for the writer thread to finish after close()"""
+        self.thread.join()
+
+    def _assemble(self) -> None:
+        """Build the animated file from the recorded frames and remove them"""
+        try:
+            if self.written:
+                frames = self._read_frames()
+                next(frames).save(self.output_path, save_all=True, append_images=frames,
+                                  duration=1000 // self.fps, loop=0)
+        except Exception as e:
+            print(f"Error assembling capture: {e}")
+        finally:
+            shutil.rmtree(self.frame_dir, ignore_errors=True)
+
+    def _frame_path(self, index: int) -> str:
+        return os.path.join(self.frame_dir, f"frame_{index:06d}.png")
+
+    def _read_frames(self) -> Iterator[Image.Image]:
+        """
+        Open the recorded frames one at a time. Only the compressed bytes are
+        read up front, so no file handle stays open per frame and pixels are
+        decoded when the encoder gets to each frame.
+        """
+        for index in range(self.written):
+            with open(self._frame_path(index), 'rb') as f:
+                yield Image.open(io.BytesIO(f.read()))
+
+    def _write_frames(self) -> None:
+        """Encode submitted buffers and return them to the free ring"""
+        while True:
+            surface = self.filled.get()
+            if surface is None:
+                if self.fmt != "png":
+                    self._assemble()
+                return
+
+            # pixels3d is a view of the surface as (width, height, 3)
+            pixels = pygame.surfarray.pixels3d(surface)
+            image = Image.fromarray(pixels.transpose(1, 0, 2))
+            del pixels  # Unlock the surface before it is reused
+            self.free.put(surface)
+
+            # Intermediate frames favour speed over size
+            image.save(self._frame_path(self.written),
+                       compress_level=6 if self.fmt == "png" else 1)
+            self.written += 1
@@ -1,7 +1,14 @@
-# Window dimensions
+# Window dimensions (logical playfield; the game always renders at this size)
 WINDOW_WIDTH = 800
 WINDOW_HEIGHT = 600
 
+# Display settings
+# The logical surface is scaled once per frame to fit the (resizable) window.
+# With integer scaling it is magnified by the largest whole factor that fits
+# and letterboxed, which keeps pixels crisp on large displays.
+DISPLAY_SIZE = (WINDOW_WIDTH, WINDOW_HEIGHT)
+INTEGER_SCALING = False
+
 # Paddle dimensions
 PADDLE_WIDTH = 15
 PADDLE_HEIGHT = 90
@@ -11,6 +18,13 @@ PADDLE_SPEED = 7
 BALL_SIZE = 15
 BALL_SPEED = 7
 
+# Physics modes
+# 'fixed' keeps ball state in integer fixed point so that every tick is
+# bit-exact across machines (lockstep replays, distributed evaluation)
+PHYSICS_FLOAT = "float"
+PHYSICS_FIXED = "fixed"
+PHYSICS_MODE = PHYSICS_FLOAT
+
 # Colors (R, G, B)
 BLACK = (0, 0, 0)
 WHITE = (255, 255, 255)
@@ -22,29 +36,95 @@ GREEN = (0, 255, 0)
 FPS = 60
 WINNING_SCORE = 10
 
-# AI difficulty levels and their corresponding speeds and reaction times
+# Frame pacing
+# Low-latency mode samples input from KEYDOWN/KEYUP events right before the
+# physics step and waits with a sleep followed by a short busy spin
+LOW_LATENCY = False
+SPIN_TOLERANCE_MS = 2.0
+
+# Idle screens
+# While paused or after game over the loop blocks on input for up to this
+# long and only redraws when something changed
+IDLE_TIMEOUT_MS = 500
+
+# Frame capture
+# Frames are rendered into a ring of preallocated buffers; when all of them
+# are waiting on the encoder, new frames are dropped instead of stalling
+CAPTURE_DIR = "captures"
+CAPTURE_FORMAT = "png"
+CAPTURE_BUFFERS = 8
+# Pillow holds every GIF frame in memory while writing the file, so GIF
+# captures stop recording after this many frames (10 s at 60 FPS)
+CAPTURE_GIF_MAX_FRAMES = 600
+
+# AI difficulty levels
+# reaction_delay: frames between two decisions
+# prediction_accuracy: chance that a decision predicts the ball correctly
+# speed: AI paddle speed in pixels per frame
+# Regenerate with `python -m game.calibrate` to hit target win rates
 AI_DIFFICULTY_LEVELS = {
     'EASY': {
-        'speed': 5,
-        'reaction_time': 0.3,
-        'prediction_error': 0.3
+        'reaction_delay': 30,
+        'prediction_accuracy': 0.6,
+        'speed': 5
     },
     'MEDIUM': {
-        'speed': 6,
-        'reaction_time': 0.2,
-        'prediction_error': 0.2
+        'reaction_delay': 15,
+        'prediction_accuracy': 0.8,
+        'speed': 6
     },
     'HARD': {
-        'speed': 7,
-        'reaction_time': 0.1,
-        'prediction_error': 0.1
+        'reaction_delay': 5,
+        'prediction_accuracy': 0.95,
+        'speed': 7
     }
 }
 
+# Visual effects
+# Particles live in a fixed-capacity pool; when updating and drawing them
+# takes longer than the budget, fewer are emitted and drawn
+EFFECTS_ENABLED = True
+EFFECTS_CAPACITY = 512
+EFFECTS_BUDGET_MS = 1.0
+TRAIL_LIFE = 12
+SPARK_COUNT = 16
+SPARK_LIFE = 20
+SPARK_SPEED = 4
+
 # Text settings
 FONT_SIZE = 36
 SCORE_OFFSET = 30
 
+# Spectator broadcast
+# The running game publishes every tick into a shared memory ring that any
+# number of local spectator processes can read. Enable it here or toggle it
+# in game with KEY_BROADCAST, then run `python -m game.spectator`
+BROADCAST_ENABLED = False
+BROADCAST_NAME = "lollms_pong"
+BROADCAST_SLOTS = 64
+
+# Networked play
+# The server is authoritative and sends quantized state deltas every tick
+NET_HOST = "127.0.0.1"
+NET_PORT = 5555
+NET_TICK_RATE = 60
+NET_MAX_WRITE_BUFFER = 64 * 1024   # Clients that fall this far behind are dropped
+
+# Rollback netcode
+# Local input is applied ROLLBACK_INPUT_DELAY ticks late to hide some of the
+# network delay; the remote paddle is predicted and corrected by re-simulating
+# at most ROLLBACK_WINDOW ticks
+ROLLBACK_INPUT_DELAY = 2
+ROLLBACK_WINDOW = 8
+
+# Match host
+# Many headless matches share one event loop. Each turn a match runs at most
+# SCHEDULER_QUANTUM ticks, and the loop is yielded every SCHEDULER_SLICE_MS
+SCHEDULER_QUANTUM = 16
+SCHEDULER_SLICE_MS = 5.0
+SCHEDULER_MAX_MATCHES = 10000
+SCHEDULER_EVENT_BACKLOG = 256   # Unread events before a match is held back
+
 # Game states
 STATE_MENU = "MENU"
 STATE_PLAYING = "PLAYING"
@@ -57,4 +137,6 @@ KEY_DOWN1 = 's'
 KEY_UP2 = 'up'
 KEY_DOWN2 = 'down'
 KEY_PAUSE = 'p'
-KEY_QUIT = 'q'
\ No newline at end of file
+KEY_QUIT = 'q'
+KEY_CAPTURE = 'f12'
+KEY_BROADCAST = 'f11'
\ No newline at end of file
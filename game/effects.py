@@ -0,0 +1,142 @@
+import time
+from typing import List
+import numpy as np
+import pygame
+from .constants import (BALL_SIZE, WHITE, EFFECTS_CAPACITY, EFFECTS_BUDGET_MS,
+                        TRAIL_LIFE, SPARK_COUNT, SPARK_LIFE, SPARK_SPEED)
+
+# Particle kinds
+KIND_TRAIL = 0
+KIND_SPARK = 1
+
+SPARK_SIZE = 4
+SPARK_COLOR = (255, 220, 120)
+
+# Sprites are pre-rendered at this many alpha levels per kind
+FADE_LEVELS = 8
+
+# Precomputed spark directions, cycled through instead of drawing random numbers
+SPARK_DIRECTIONS = 64
+
+
+class Effects:
+    def __init__(self, capacity: int = EFFECTS_CAPACITY, budget_ms: float = EFFECTS_BUDGET_MS):
+        """
+        Ball trail and paddle-hit sparks.
+        Particle state lives in fixed-capacity arrays allocated once, with a
+        free list of unused slots; emitting or expiring a particle never
+        allocates. Updates are batched with NumPy.
+        When update+draw exceed budget_ms, fewer particles are emitted and
+        drawn until the cost is back under budget.
+        """
+        self.capacity = capacity
+        self.budget = budget_ms / 1000.0
+        self.update_cost = 0.0
+        self.cost = 0.0
+        self.limit = capacity
+        self.dropped = 0
+
+        self.x = np.zeros(capacity, dtype=np.float32)
+        self.y = np.zeros(capacity, dtype=np.float32)
+        self.vx = np.zeros(capacity, dtype=np.float32)
+        self.vy = np.zeros(capacity, dtype=np.float32)
+        self.life = np.zeros(capacity, dtype=np.int16)
+        self.kind = np.zeros(capacity, dtype=np.int16)
+        self.free = np.arange(capacity - 1, -1, -1, dtype=np.int32)
+        self.free_count = capacity
+        self.max_life = np.array((TRAIL_LIFE, SPARK_LIFE), dtype=np.int16)
+
+        # Scratch space for update(), so that it does not allocate
+        self.indices = np.arange(capacity, dtype=np.int32)
+        self.alive = np.zeros(capacity, dtype=bool)
+        self.expired = np.zeros(capacity, dtype=bool)
+
+        # Unit vectors spread around the circle for spark velocities
+        self.directions = [(pygame.math.Vector2(1, 0).rotate(i * 360 / SPARK_DIRECTIONS))
+                           for i in range(SPARK_DIRECTIONS)]
+        self.next_direction = 0
+
+        self.sprites = self._render_sprites()
+
+    def _render_sprites(self) -> List[pygame.Surface]:
+        """Pre-render every kind at every fade level, indexed kind * FADE_LEVELS + level"""
+        sprites = []
+        for size, color in ((BALL_SIZE, WHITE), (SPARK_SIZE, SPARK_COLOR)):
+            for level in range(FADE_LEVELS):
+                sprite = pygame.Surface((size, size), pygame.SRCALPHA)
+                sprite.fill((*color, 255 * (level + 1) // (FADE_LEVELS + 1)))
+                if pygame.display.get_surface() is not None:
+                    sprite = sprite.convert_alpha()
+                sprites.append(sprite)
+        return sprites
+
+    @property
+    def active_count(self) -> int:
+        """Number of live particles"""
+        return self.capacity - self.free_count
+
+    def emit(self, kind: int, x: float, y: float, vx: float = 0.0, vy: float = 0.0) -> None:
+        """Spawn one particle, or count it as dropped when the pool is full"""
+        if self.free_count == 0 or self.active_count >= self.limit:
+            self.dropped += 1
+            return
+        self.free_count -= 1
+        index = self.free[self.free_count]
+        self.x[index] = x
+        self.y[index] = y
+        self.vx[index] = vx
+        self.vy[index] = vy
+        self.life[index] = self.max_life[kind]
+        self.kind[index] = kind
+
+    def trail(self, ball) -> None:
+        """Leave a fading copy of the ball behind it"""
+        self.emit(KIND_TRAIL, ball.x, ball.y)
+
+    def sparks(self, x: float, y: float, direction: int) -> None:
+        """Burst of sparks flying away from a paddle; direction is +1 or -1 in x"""
+        count = max(1, SPARK_COUNT * self.limit // self.capacity)
+        for _ in range(count):
+            dx, dy = self.directions[self.next_direction]
+            self.next_direction = (self.next_direction + 7) % SPARK_DIRECTIONS
+            self.emit(KIND_SPARK, x, y, abs(dx) * direction * SPARK_SPEED, dy * SPARK_SPEED)
+
+    def update(self) -> None:
+        """Advance every live particle by one frame and recycle expired ones"""
+        start = time.perf_counter()
+        np.greater(self.life, 0, out=self.alive)
+        self.x += self.vx
+        self.y += self.vy
+        self.life -= self.alive
+        np.equal(self.life, 0, out=self.expired)
+        self.expired &= self.alive
+        count = np.count_nonzero(self.expired)
+        if count:
+            # Push the expired slots straight onto the free list
+            np.compress(self.expired, self.indices,
+                        out=self.free[self.free_count:self.free_count + count])
+            self.free_count += count
+        self.update_cost = time.perf_counter() - start
+
+    def draw(self, screen: pygame.Surface) -> None:
+        """Draw every live particle in a single blits call"""
+        start = time.perf_counter()
+        live = np.flatnonzero(self.life > 0)
+        levels = self.life[live] * FADE_LEVELS // self.max_life[self.kind[live]]
+        sprite_ids = (self.kind[live] * FADE_LEVELS + np.minimum(levels, FADE_LEVELS - 1)).tolist()
+        positions = zip(self.x[live].tolist(), self.y[live].tolist())
+
+        sprites = self.sprites
+        screen.blits([(sprites[sprite_id], position)
+                      for sprite_id, position in zip(sprite_ids, positions)], doreturn=False)
+        # Only this frame counts: while paused, draw() runs without update()
+        self.cost = self.update_cost + time.perf_counter() - start
+        self.update_cost = 0.0
+        self._adapt()
+
+    def _adapt(self) -> None:
+        """Shrink or grow the particle limit to stay within the frame budget"""
+        if self.cost > self.budget:
+            self.limit = max(self.capacity // 16, self.limit // 2)
+        elif self.cost < self.budget / 2 and self.limit < self.capacity:
+            self.limit = min(self.capacity, self.limit + self.capacity // 16)
@@ -0,0 +1,174 @@
+import random
+import numpy as np
+import pygame
+from .constants import WINDOW_WIDTH, WINDOW_HEIGHT, BALL_SIZE, BALL_SPEED, WHITE
+
+# Positions and velocities are stored in 24.8 fixed point
+FIXED_SHIFT = 8
+FIXED_ONE = 1 << FIXED_SHIFT
+
+# sin(0..60 degrees) scaled by 2**14, precomputed so that no platform's
+# libm is involved when the ball bounces off a paddle
+SINE_SHIFT = 14
+SINE_TABLE = (
+    0, 286, 572, 857, 1143, 1428, 1713, 1997, 2280, 2563,
+    2845, 3126, 3406, 3686, 3964, 4240, 4516, 4790, 5063, 5334,
+    5604, 5872, 6138, 6402, 6664, 6924, 7182, 7438, 7692, 7943,
+    8192, 8438, 8682, 8923, 9162, 9397, 9630, 9860, 10087, 10311,
+    10531, 10749, 10963, 11174, 11381, 11585, 11786, 11982, 12176, 12365,
+    12551, 12733, 12911, 13085, 13255, 13421, 13583, 13741, 13894, 14044,
+    14189,
+)
+MAX_BOUNCE_ANGLE = 60
+
+# Speed-up after each paddle hit, as an exact ratio (1.1x)
+SPEED_UP_NUM = 11
+SPEED_UP_DEN = 10
+
+BALL_SIZE_FX = BALL_SIZE * FIXED_ONE
+BALL_SPEED_FX = BALL_SPEED * FIXED_ONE
+MAX_X_FX = (WINDOW_WIDTH - BALL_SIZE) * FIXED_ONE
+MAX_Y_FX = (WINDOW_HEIGHT - BALL_SIZE) * FIXED_ONE
+
+_SINE_ARRAY = np.array(SINE_TABLE, dtype=np.int32)
+
+
+def to_fixed(value: float) -> int:
+    """Convert a pixel value to fixed point"""
+    return int(round(value * FIXED_ONE))
+
+
+def bounce_speed_y(relative_intersect: int, half_height: int) -> int:
+    """
+    Vertical speed after a paddle hit, in fixed point.
+    Integer version of -BALL_SPEED * sin(normalized_intersect * 60 degrees).
+    Divisions truncate toward zero so that hits above and below the paddle
+    centre mirror each other exactly.
+    """
+    sign = -1 if relative_intersect < 0 else 1
+    angle = min(MAX_BOUNCE_ANGLE, abs(relative_intersect) * MAX_BOUNCE_ANGLE // half_height)
+    return -sign * ((BALL_SPEED_FX * SINE_TABLE[angle]) >> SINE_SHIFT)
+
+
+def speed_up(speed: int) -> int:
+    """Apply the per-hit speed multiplier in integer arithmetic, symmetric in sign"""
+    sign = -1 if speed < 0 else 1
+    return sign * (abs(speed) * SPEED_UP_NUM // SPEED_UP_DEN)
+
+
+class FixedBall:
+    def __init__(self):
+        """Ball with integer fixed-point physics, interchangeable with Ball"""
+        self.size = BALL_SIZE
+        self.last_intersect = 0.0
+        self.reset()
+
+    def reset(self, rng: random.Random = None):
+        """Reset ball to center position with random direction"""
+        rng = rng or random
+        self.fx = (WINDOW_WIDTH // 2) * FIXED_ONE
+        self.fy = (WINDOW_HEIGHT // 2) * FIXED_ONE
+        self.fvx = BALL_SPEED_FX if rng.getrandbits(1) else -BALL_SPEED_FX
+        self.fvy = rng.randint(-BALL_SPEED_FX, BALL_SPEED_FX)
+
+    @property
+    def x(self) -> float:
+        return self.fx / FIXED_ONE
+
+    @property
+    def y(self) -> float:
+        return self.fy / FIXED_ONE
+
+    @property
+    def speed_x(self) -> float:
+        return self.fvx / FIXED_ONE
+
+    @property
+    def speed_y(self) -> float:
+        return self.fvy / FIXED_ONE
+
+    def move(self):
+        """Update ball position and handle wall collisions"""
+        self.fx += self.fvx
+        self.fy += self.fvy
+
+        # Handle top and bottom wall collisions
+        if self.fy <= 0 or self.fy >= MAX_Y_FX:
+            self.fvy = -self.fvy
+
+    def draw(self, screen):
+        """Draw the ball on the screen"""
+        pygame.draw.rect(screen, WHITE, (self.x, self.y, self.size, self.size))
+
+    def check_collision(self, paddle):
+        """Check for collision with a paddle and handle bounce"""
+        paddle_x = paddle.x * FIXED_ONE
+        paddle_y = paddle.y * FIXED_ONE
+        paddle_height = paddle.height * FIXED_ONE
+
+        if (self.fx < paddle_x + paddle.width * FIXED_ONE and
+                self.fx + BALL_SIZE_FX > paddle_x and
+                self.fy < paddle_y + paddle_height and
+                self.fy + BALL_SIZE_FX > paddle_y):
+            # Reverse horizontal direction
+            self.fvx = -self.fvx
+
+            # Vary the bounce angle with the collision point
+            half_height = paddle_height // 2
+            relative_intersect = (paddle_y + half_height) - (self.fy + BALL_SIZE_FX // 2)
+            self.last_intersect = relative_intersect / half_height
+            self.fvy = bounce_speed_y(relative_intersect, half_height)
+
+            # Slightly increase speed after each paddle hit
+            self.fvx = speed_up(self.fvx)
+            self.fvy = speed_up(self.fvy)
+
+            return True
+
+        return False
+
+    def is_out_of_bounds(self):
+        """Check if ball has gone past paddles"""
+        return self.fx < 0 or self.fx > MAX_X_FX
+
+    def get_position(self):
+        """Return current ball position"""
+        return (self.x, self.y)
+
+
+def _speed_up_array(speed: np.ndarray) -> np.ndarray:
+    """speed_up over an array"""
+    return np.sign(speed) * (np.abs(speed) * SPEED_UP_NUM // SPEED_UP_DEN)
+
+
+def move_balls(x: np.ndarray, y: np.ndarray, vx: np.ndarray, vy: np.ndarray) -> None:
+    """FixedBall.move over int32 arrays, in place"""
+    x += vx
+    y += vy
+    np.negative(vy, out=vy, where=(y <= 0) | (y >= MAX_Y_FX))
+
+
+def collide_balls(x: np.ndarray, y: np.ndarray, vx: np.ndarray, vy: np.ndarray,
+                  paddle_x: np.ndarray, paddle_y: np.ndarray,
+                  paddle_width: int, paddle_height: int) -> np.ndarray:
+    """
+    FixedBall.check_collision over int32 arrays, in place.
+    Paddle positions are in fixed point, sizes in pixels.
+    Returns: mask of the balls that hit their paddle
+    """
+    width = paddle_width * FIXED_ONE
+    height = paddle_height * FIXED_ONE
+    hit = ((x < paddle_x + width) & (x + BALL_SIZE_FX > paddle_x) &
+           (y < paddle_y + height) & (y + BALL_SIZE_FX > paddle_y))
+
+    half_height = height // 2
+    relative_intersect = (paddle_y + half_height) - (y + BALL_SIZE_FX // 2)
+    # Same truncation toward zero as bounce_speed_y and speed_up
+    sign = np.where(relative_intersect < 0, -1, 1)
+    angle = np.minimum(np.abs(relative_intersect) * MAX_BOUNCE_ANGLE // half_height,
+                       MAX_BOUNCE_ANGLE)
+    bounce = -sign * ((BALL_SPEED_FX * _SINE_ARRAY[angle]) >> SINE_SHIFT)
+
+    vx[hit] = _speed_up_array(-vx[hit])
+    vy[hit] = _speed_up_array(bounce[hit])
+    return hit
@@ -1,23 +1,55 @@
 import pygame
+import time
+from collections import defaultdict
 from typing import Tuple, Optional
 from .constants import *
 from .paddle import Paddle
 from .ball import Ball
+from .fixed_physics import FixedBall
 from .ai import AI
 from .leaderboard import Leaderboard
+from .timing import FramePacer
+from .capture import FrameCapture
+from .effects import Effects
+from .spectator import BroadcastState, StatePublisher
 
 class Game:
-    def __init__(self):
+    def __init__(self, display_size: Tuple[int, int] = DISPLAY_SIZE,
+                 integer_scaling: bool = INTEGER_SCALING,
+                 low_latency: bool = LOW_LATENCY,
+                 physics: str = PHYSICS_MODE,
+                 broadcast: bool = BROADCAST_ENABLED):
         # Initialize game components
-        self.screen = pygame.display.set_mode((WINDOW_WIDTH, WINDOW_HEIGHT))
+        self.window = pygame.display.set_mode(display_size, pygame.RESIZABLE)
         pygame.display.set_caption("LollmsPong")
         self.clock = pygame.time.Clock()
+
+        # Everything is drawn to a fixed logical surface, then scaled once
+        # per frame to the window, so draw cost does not grow with display size
+        self.render_surface = pygame.Surface((WINDOW_WIDTH, WINDOW_HEIGHT)).convert()
+        self.screen = self.render_surface
+        self.capture: Optional[FrameCapture] = None
+        self.closing_captures = []
+        self.publisher: Optional[StatePublisher] = None
+        self.tick = 0
+        self.integer_scaling = integer_scaling
+        self.scaled_target: Optional[pygame.Surface] = None
+        self.scaled_rect = self.screen.get_rect()
+        self.resize(self.window.get_size())
+
+        # Low-latency input: key state is tracked from timestamped events
+        self.low_latency = low_latency
+        self.pacer = FramePacer() if low_latency else None
+        self.pressed = defaultdict(bool)
+        self.input_time: Optional[float] = None
+        self.polled_events = []
         
         # Create game objects
         self.paddle1 = Paddle(50, WINDOW_HEIGHT//2 - PADDLE_HEIGHT//2, BLUE)
         self.paddle2 = Paddle(WINDOW_WIDTH - 50 - PADDLE_WIDTH, 
                             WINDOW_HEIGHT//2 - PADDLE_HEIGHT//2, RED)
-        self.ball = Ball(WINDOW_WIDTH//2, WINDOW_HEIGHT//2)
+        self.ball = FixedBall() if physics == PHYSICS_FIXED else Ball()
+        self.effects = Effects() if EFFECTS_ENABLED else None
         
         # Game state
         self.score1 = 0
@@ -33,8 +65,21 @@ class Game:
         self.font = pygame.font.Font(None, 74)
         self.small_font = pygame.font.Font(None, 36)
 
+        # Text that rarely changes is rendered once and reused
+        self.pause_surf = self.font.render("PAUSED", True, WHITE)
+        self.winner_surfs = {player: self.font.render(f"Player {player} Wins!", True, WHITE)
+                             for player in (1, 2)}
+        self.score_surfs = {}
+        self.idle_drawn = False
+
+        if broadcast:
+            self.start_broadcast()
+
     def handle_input(self) -> None:
-        keys = pygame.key.get_pressed()
+        if self.low_latency:
+            keys = self.pressed
+        else:
+            keys = pygame.key.get_pressed()
         
         # Player 1 controls
         if keys[pygame.K_w]:
@@ -52,17 +97,34 @@ class Game:
     def update(self) -> None:
         if self.paused or self.game_over:
             return
+        self.tick += 1
 
         self.ball.move()
         
         # AI movement in AI mode
         if self.game_mode == 'AI':
-            self.ai.calculate_move(self.paddle2, self.ball)
+            move = self.ai.calculate_move(self.paddle2.y, self.ball.get_position(),
+                                          (self.ball.speed_x, self.ball.speed_y))
+            if move > 0:
+                self.paddle2.move_down()
+            elif move < 0:
+                self.paddle2.move_up()
             
-        # Check collisions
-        if self.ball.check_collision(self.paddle1) or \
-           self.ball.check_collision(self.paddle2):
-            self.ball.speed_x *= -1
+        # Check collisions; check_collision already reverses the ball, and
+        # only the paddle it travels towards is tested
+        if self.ball.speed_x < 0:
+            hit = self.ball.check_collision(self.paddle1)
+        else:
+            hit = self.ball.check_collision(self.paddle2)
+
+        if self.effects:
+            self.effects.update()
+            self.effects.trail(self.ball)
+            if hit:
+                # The ball has already been reversed, so sparks follow it
+                self.effects.sparks(self.ball.x + self.ball.size / 2,
+                                    self.ball.y + self.ball.size / 2,
+                                    1 if self.ball.speed_x > 0 else -1)
             
         # Score points
         if self.ball.x <= 0:
@@ -77,20 +139,26 @@ class Game:
             self.game_over = True
             self.winner = 1 if self.score1 >= 10 else 2
             self.leaderboard.add_score(f"Player {self.winner}", 
-                                     max(self.score1, self.score2))
+                                     max(self.score1, self.score2), self.game_mode)
 
     def draw(self) -> None:
+        # While capturing, render straight into a free capture buffer
+        frame = self.capture.acquire() if self.capture else None
+        self.screen = frame if frame is not None else self.render_surface
+
         # Clear screen
         self.screen.fill(BLACK)
         
         # Draw game objects
+        if self.effects:
+            self.effects.draw(self.screen)
         self.paddle1.draw(self.screen)
         self.paddle2.draw(self.screen)
         self.ball.draw(self.screen)
         
         # Draw score
-        score_surf1 = self.font.render(str(self.score1), True, WHITE)
-        score_surf2 = self.font.render(str(self.score2), True, WHITE)
+        score_surf1 = self.render_score(self.score1)
+        score_surf2 = self.render_score(self.score2)
         self.screen.blit(score_surf1, (WINDOW_WIDTH//4, 20))
         self.screen.blit(score_surf2, (3*WINDOW_WIDTH//4, 20))
         
@@ -101,23 +169,82 @@ class Game:
         
         # Draw pause/game over message
         if self.paused:
-            pause_surf = self.font.render("PAUSED", True, WHITE)
-            self.screen.blit(pause_surf, 
-                           (WINDOW_WIDTH//2 - pause_surf.get_width()//2, 
+            self.screen.blit(self.pause_surf, 
+                           (WINDOW_WIDTH//2 - self.pause_surf.get_width()//2, 
                             WINDOW_HEIGHT//2))
         
         if self.game_over:
-            game_over_surf = self.font.render(f"Player {self.winner} Wins!", 
-                                            True, WHITE)
+            game_over_surf = self.winner_surfs[self.winner]
             self.screen.blit(game_over_surf, 
                            (WINDOW_WIDTH//2 - game_over_surf.get_width()//2, 
                             WINDOW_HEIGHT//2))
         
+        self.present()
+
+        if frame is not None:
+            self.capture.submit(frame)
+
+    def start_broadcast(self, name: str = BROADCAST_NAME) -> None:
+        """Start publishing every tick for spectator processes"""
+        if self.publisher is None:
+            self.publisher = StatePublisher(name)
+
+    def stop_broadcast(self) -> None:
+        """Stop publishing and release the shared memory"""
+        if self.publisher is not None:
+            self.publisher.close()
+            self.publisher = None
+
+    def publish(self) -> None:
+        """Send the current state to spectators, if broadcasting"""
+        if self.publisher is not None:
+            self.publisher.publish(BroadcastState(
+                self.tick, self.ball.x, self.ball.y, self.paddle1.y, self.paddle2.y,
+                self.score1, self.score2, self.paused, self.game_over))
+
+    def render_score(self, score: int) -> pygame.Surface:
+        """Get the rendered surface for a score, rendering it only once"""
+        if score not in self.score_surfs:
+            self.score_surfs[score] = self.font.render(str(score), True, WHITE)
+        return self.score_surfs[score]
+
+    def resize(self, size: Tuple[int, int]) -> None:
+        """Recompute the scaled output area after the window size changed"""
+        window_width, window_height = size
+        factor = min(window_width // WINDOW_WIDTH, window_height // WINDOW_HEIGHT)
+        if self.integer_scaling and factor >= 1:
+            scaled_size = (WINDOW_WIDTH * factor, WINDOW_HEIGHT * factor)
+        else:
+            # Keep the aspect ratio and letterbox the remaining space; also
+            # used when the window is too small for integer scaling
+            factor = min(window_width / WINDOW_WIDTH, window_height / WINDOW_HEIGHT)
+            scaled_size = (max(1, int(WINDOW_WIDTH * factor)),
+                           max(1, int(WINDOW_HEIGHT * factor)))
+
+        self.scaled_rect = pygame.Rect((0, 0), scaled_size)
+        self.scaled_rect.center = (window_width // 2, window_height // 2)
+
+        # Scale straight into this area of the window, without an
+        # intermediate surface; the subsurface is only valid for this window
+        if scaled_size == (WINDOW_WIDTH, WINDOW_HEIGHT):
+            self.scaled_target = None
+        else:
+            self.scaled_target = self.window.subsurface(self.scaled_rect)
+
+        self.window.fill(BLACK)
+
+    def present(self) -> None:
+        """Scale the logical surface to the window and flip the display"""
+        if self.scaled_target is None:
+            self.window.blit(self.screen, self.scaled_rect)
+        else:
+            pygame.transform.scale(self.screen, self.scaled_rect.size, self.scaled_target)
         pygame.display.flip()
 
     def set_mode(self, mode: str) -> None:
         """Set game mode to either 'VS' or 'AI'"""
         self.game_mode = mode
+        self.paddle2.speed = self.ai.speed if mode == 'AI' else PADDLE_SPEED
         self.reset_game()
 
     def reset_game(self) -> None:
@@ -133,24 +260,123 @@ class Game:
     def toggle_pause(self) -> None:
         """Toggle pause state"""
         self.paused = not self.paused
+        self.publish()
+
+    def start_capture(self, output_dir: str = CAPTURE_DIR,
+                      fmt: str = CAPTURE_FORMAT) -> None:
+        """Start recording rendered frames"""
+        if self.capture is None:
+            self.capture = FrameCapture(output_dir, fmt)
+
+    def stop_capture(self, wait: bool = False) -> None:
+        """
+        Stop recording. Pending frames are flushed and animated files are
+        assembled in the background, unless wait is set.
+        """
+        if self.capture is not None:
+            capture, self.capture = self.capture, None
+            capture.close(wait=False)
+            self.closing_captures = [c for c in self.closing_captures if c.thread.is_alive()]
+            self.closing_captures.append(capture)
+            print(f"Captured {capture.accepted} frames, dropped {capture.dropped}")
+        if wait:
+            for capture in self.closing_captures:
+                capture.join()
+            self.closing_captures = []
+
+    def handle_event(self, event: pygame.event.Event) -> bool:
+        """
+        Handle a single event
+        Returns: False when the game should quit
+        """
+        if event.type == pygame.QUIT:
+            return False
+        elif event.type == pygame.VIDEORESIZE:
+            self.window = pygame.display.get_surface()
+            self.resize(self.window.get_size())
+        elif event.type == pygame.KEYDOWN:
+            self.pressed[event.key] = True
+            if event.key == pygame.K_ESCAPE:
+                self.toggle_pause()
+            elif event.key == pygame.K_r and self.game_over:
+                self.reset_game()
+            elif event.key == pygame.K_F11:
+                if self.publisher is None:
+                    self.start_broadcast()
+                else:
+                    self.stop_broadcast()
+            elif event.key == pygame.K_F12:
+                if self.capture is None:
+                    self.start_capture()
+                else:
+                    self.stop_capture()
+        elif event.type == pygame.KEYUP:
+            self.pressed[event.key] = False
+
+        return True
+
+    def poll_events(self) -> None:
+        """Queue pending events and timestamp the first input among them"""
+        events = pygame.event.get()
+        if self.input_time is None and any(
+                event.type in (pygame.KEYDOWN, pygame.KEYUP) for event in events):
+            self.input_time = time.perf_counter()
+        self.polled_events.extend(events)
+
+    def idle(self) -> bool:
+        """
+        Wait for input while nothing moves, redrawing only after an event
+        Returns: False when the game should quit
+        """
+        if not self.idle_drawn:
+            self.draw()
+            self.idle_drawn = True
+
+        event = pygame.event.wait(IDLE_TIMEOUT_MS)
+        if event.type == pygame.NOEVENT:
+            return True
+        self.idle_drawn = False
+        return self.handle_event(event)
 
     def run(self) -> None:
         """Main game loop"""
         running = True
         while running:
+            if self.paused or self.game_over:
+                running = self.idle()
+                if self.low_latency:
+                    # The time spent idle is not a frame interval
+                    self.pacer.resume()
+                continue
+            self.idle_drawn = False
+
+            if self.low_latency:
+                # Sleep first, then sample input right before the physics step;
+                # events arriving meanwhile are timestamped but applied now
+                self.pacer.wait(self.poll_events)
+
             # Event handling
-            for event in pygame.event.get():
-                if event.type == pygame.QUIT:
-                    running = False
-                elif event.type == pygame.KEYDOWN:
-                    if event.key == pygame.K_ESCAPE:
-                        self.toggle_pause()
-                    elif event.key == pygame.K_r and self.game_over:
-                        self.reset_game()
+            self.poll_events()
+            events, self.polled_events = self.polled_events, []
+            for event in events:
+                running = self.handle_event(event) and running
 
             self.handle_input()
             self.update()
+            self.publish()
             self.draw()
-            self.clock.tick(FPS)
+
+            if self.low_latency:
+                self.pacer.frame_done(self.input_time)
+                self.input_time = None
+            else:
+                self.clock.tick(FPS)
+
+        self.stop_capture(wait=True)
+        self.stop_broadcast()
+
+        if self.low_latency:
+            for name, value in self.pacer.report().items():
+                print(f"{name}: {value:.2f}")
 
         pygame.quit()
\ No newline at end of file
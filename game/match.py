@@ -0,0 +1,202 @@
+import json
+import math
+import random
+from typing import Callable, Dict, Optional, Tuple
+from .constants import (WINDOW_WIDTH, WINDOW_HEIGHT, PADDLE_WIDTH, PADDLE_HEIGHT,
+                        BALL_SPEED, WINNING_SCORE, PHYSICS_MODE, PHYSICS_FIXED)
+from .paddle import Paddle
+from .ball import Ball
+from .fixed_physics import FixedBall
+from .ai import AI
+
+# Point-win causes recorded with every point
+CAUSE_ACE = "ace"            # The serve was never returned
+CAUSE_EDGE = "edge"          # Beaten by a steep shot off the paddle edge
+CAUSE_SPEED = "speed"        # Beaten by a fast ball
+CAUSE_MISS = "miss"          # Anything else
+
+EDGE_INTERSECT = 0.8
+FAST_BALL_SPEED = 2 * BALL_SPEED
+
+
+class Match:
+    def __init__(self, ai1: Optional[AI] = None, ai2: Optional[AI] = None,
+                 seed: Optional[int] = None, winning_score: int = WINNING_SCORE,
+                 on_event: Optional[Callable[[Dict], None]] = None,
+                 physics: str = PHYSICS_MODE):
+        """
+        Headless match using the same Paddle and Ball rules as Game.
+        Paddles without an AI are driven by the moves passed to step().
+        on_event is called with a dict for every serve, hit, point and end.
+        physics: PHYSICS_FIXED for bit-exact integer ball physics
+        """
+        self.rng = random.Random(seed)
+        self.paddle1 = Paddle(50, WINDOW_HEIGHT//2 - PADDLE_HEIGHT//2)
+        self.paddle2 = Paddle(WINDOW_WIDTH - 50 - PADDLE_WIDTH,
+                              WINDOW_HEIGHT//2 - PADDLE_HEIGHT//2)
+        self.ball = FixedBall() if physics == PHYSICS_FIXED else Ball()
+        self.ai1 = ai1
+        self.ai2 = ai2
+        if ai1 is not None:
+            self.paddle1.speed = ai1.speed
+        if ai2 is not None:
+            self.paddle2.speed = ai2.speed
+        self.winning_score = winning_score
+        self.on_event = on_event
+
+        self.tick = 0
+        self.score1 = 0
+        self.score2 = 0
+        self.rally = 0
+        self.game_over = False
+        self.winner = None
+        self.serve()
+
+    def emit(self, event: str, **fields) -> None:
+        """Send an event to the listener, if any"""
+        if self.on_event is not None:
+            fields["event"] = event
+            fields["tick"] = self.tick
+            self.on_event(fields)
+
+    def serve(self) -> None:
+        """Put the ball back in play from the center"""
+        self.ball.reset(self.rng)
+        self.ball.last_intersect = 0.0
+        self.rally = 0
+        self.emit("serve", speed_x=self.ball.speed_x, speed_y=self.ball.speed_y)
+
+    def step(self, move1: int = 0, move2: int = 0) -> None:
+        """
+        Advance the match by one tick
+        move1, move2: 1 for down, -1 for up, 0 for no movement
+        (the same convention as AI.calculate_move)
+        """
+        if self.game_over:
+            return
+        self.tick += 1
+
+        if self.ai1 is not None:
+            # The AI expects to defend the right side, so mirror the field
+            move1 = self.ai1.calculate_move(self.paddle1.y,
+                                            (WINDOW_WIDTH - self.ball.x, self.ball.y),
+                                            (-self.ball.speed_x, self.ball.speed_y))
+        if self.ai2 is not None:
+            move2 = self.ai2.calculate_move(self.paddle2.y, self.ball.get_position(),
+                                            (self.ball.speed_x, self.ball.speed_y))
+        self._move_paddle(self.paddle1, move1)
+        self._move_paddle(self.paddle2, move2)
+
+        self.ball.move()
+
+        # Only test the paddle the ball is travelling towards, so it cannot
+        # bounce back and forth while overlapping a paddle
+        if self.ball.speed_x < 0:
+            if self.ball.check_collision(self.paddle1):
+                self._hit(1)
+        elif self.ball.check_collision(self.paddle2):
+            self._hit(2)
+
+        if self.ball.is_out_of_bounds():
+            self._point(2 if self.ball.x < 0 else 1)
+
+    def save_state(self) -> Tuple:
+        """
+        Snapshot everything a tick depends on, for rollback.
+        AI decision state is not included.
+        """
+        return (self.tick, self.score1, self.score2, self.rally, self.game_over,
+                self.winner, self.paddle1.y, self.paddle2.y, self.ball.__dict__.copy(),
+                self.rng.getstate())
+
+    def load_state(self, state: Tuple) -> None:
+        """Restore a snapshot taken with save_state"""
+        (self.tick, self.score1, self.score2, self.rally, self.game_over, self.winner,
+         self.paddle1.y, self.paddle2.y, ball, rng_state) = state
+        self.ball.__dict__.update(ball)
+        self.rng.setstate(rng_state)
+        self.paddle1.update()
+        self.paddle2.update()
+
+    def run(self, max_ticks: int = 1_000_000) -> Optional[int]:
+        """
+        Play until the match is over
+        Returns: the winner (1 or 2), or None if max_ticks ran out
+        """
+        while not self.game_over and self.tick < max_ticks:
+            self.step()
+        return self.winner
+
+    def _move_paddle(self, paddle: Paddle, move: int) -> None:
+        """Apply a move to a paddle"""
+        if move > 0:
+            paddle.move_down()
+        elif move < 0:
+            paddle.move_up()
+
+    def _hit(self, paddle: int) -> None:
+        """Record a paddle hit"""
+        self.rally += 1
+        self.emit("hit", paddle=paddle, intersect=self.ball.last_intersect,
+                  speed=math.hypot(self.ball.speed_x, self.ball.speed_y))
+
+    def _point(self, scorer: int) -> None:
+        """Award a point and serve again, or end the match"""
+        speed = math.hypot(self.ball.speed_x, self.ball.speed_y)
+        if self.rally == 0:
+            cause = CAUSE_ACE
+        elif abs(self.ball.last_intersect) >= EDGE_INTERSECT:
+            cause = CAUSE_EDGE
+        elif speed >= FAST_BALL_SPEED:
+            cause = CAUSE_SPEED
+        else:
+            cause = CAUSE_MISS
+
+        if scorer == 1:
+            self.score1 += 1
+        else:
+            self.score2 += 1
+        self.emit("point", scorer=scorer, rally=self.rally, speed=speed, cause=cause)
+
+        if self.score1 >= self.winning_score or self.score2 >= self.winning_score:
+            self.game_over = True
+            self.winner = scorer
+            self.emit("end", winner=scorer, score1=self.score1, score2=self.score2)
+        else:
+            self.serve()
+
+
+class MatchRecorder:
+    def __init__(self, filename: str):
+        """Write match events to a file as JSON lines"""
+        self.filename = filename
+        self.file = open(filename, "w")
+        self.matches = 0
+
+    def record(self, event: Dict) -> None:
+        """Append a single event"""
+        self.file.write(json.dumps(event) + "\n")
+
+    def start_match(self, **fields) -> None:
+        """Mark the beginning of a new match in the stream"""
+        self.matches += 1
+        self.record(dict(fields, event="start", match=self.matches))
+
+    def close(self) -> None:
+        """Close the output file"""
+        self.file.close()
+
+
+def record_matches(filename: str, count: int, difficulty1: str = "MEDIUM",
+                   difficulty2: str = "MEDIUM", seed: Optional[int] = None) -> None:
+    """Play count AI-vs-AI matches headlessly and record their events"""
+    recorder = MatchRecorder(filename)
+    rng = random.Random(seed)
+    try:
+        for _ in range(count):
+            recorder.start_match(difficulty1=difficulty1, difficulty2=difficulty2)
+            match = Match(AI(difficulty1), AI(difficulty2), seed=rng.getrandbits(32),
+                          on_event=recorder.record)
+            match.run()
+    finally:
+        recorder.close()
@@ -0,0 +1,414 @@
+import argparse
+import asyncio
+import random
+import struct
+from typing import Callable, Dict, Optional, Tuple
+import pygame
+from .constants import *
+from .ai import AI
+from .match import Match
+from .game import Game
+from .rollback import RollbackSession
+
+# Every message is a uint16 length followed by the payload, whose first
+# byte is the message type
+FRAME_HEADER = struct.Struct("<H")
+MSG_JOIN = 1        # client -> server: match id, flags
+MSG_WELCOME = 2     # server -> client: match id, player number, tick rate, seed
+MSG_INPUT = 3       # client -> server: tick, move
+MSG_STATE = 4       # server -> client: tick, changed-field mask, changed fields
+MSG_PEER_INPUT = 5  # server -> client: tick, move of the other player (rollback)
+
+# Join flags
+JOIN_VS_AI = 1      # Play against the server AI
+JOIN_ROLLBACK = 2   # Peers simulate with rollback; the server relays inputs
+
+JOIN = struct.Struct("<BIB")
+WELCOME = struct.Struct("<BIBHI")
+INPUT = struct.Struct("<BIb")
+STATE_HEADER = struct.Struct("<BIH")
+
+# State fields in wire order: name, struct code and quantization scale
+STATE_FIELDS: Tuple[Tuple[str, str, int], ...] = (
+    ("ball_x", "h", 4),
+    ("ball_y", "h", 4),
+    ("speed_x", "h", 64),
+    ("speed_y", "h", 64),
+    ("paddle1_y", "h", 4),
+    ("paddle2_y", "h", 4),
+    ("score1", "B", 1),
+    ("score2", "B", 1),
+    ("winner", "B", 1),
+)
+FIELD_STRUCTS = [struct.Struct("<" + code) for _, code, _ in STATE_FIELDS]
+FIELD_LIMITS = {"h": (-32768, 32767), "B": (0, 255)}
+
+
+def quantize(match: Match) -> Tuple[int, ...]:
+    """Turn the match state into the integers sent on the wire"""
+    values = (match.ball.x, match.ball.y, match.ball.speed_x, match.ball.speed_y,
+              match.paddle1.y, match.paddle2.y, match.score1, match.score2,
+              match.winner or 0)
+    quantized = []
+    for value, (_, code, scale) in zip(values, STATE_FIELDS):
+        low, high = FIELD_LIMITS[code]
+        quantized.append(max(low, min(high, round(value * scale))))
+    return tuple(quantized)
+
+
+def encode_state(tick: int, state: Tuple[int, ...],
+                 previous: Optional[Tuple[int, ...]] = None) -> bytes:
+    """Encode only the fields that differ from previous (all of them without one)"""
+    mask = 0
+    parts = []
+    for index, value in enumerate(state):
+        if previous is None or previous[index] != value:
+            mask |= 1 << index
+            parts.append(FIELD_STRUCTS[index].pack(value))
+    return STATE_HEADER.pack(MSG_STATE, tick, mask) + b"".join(parts)
+
+
+def decode_state(payload: bytes, state: Dict[str, float]) -> int:
+    """
+    Apply a state message to a dict of dequantized values
+    Returns: the server tick of the message
+    """
+    _, tick, mask = STATE_HEADER.unpack_from(payload)
+    offset = STATE_HEADER.size
+    for index, (name, _, scale) in enumerate(STATE_FIELDS):
+        if mask & (1 << index):
+            value = FIELD_STRUCTS[index].unpack_from(payload, offset)[0]
+            offset += FIELD_STRUCTS[index].size
+            state[name] = value / scale
+    return tick
+
+
+def frame(payload: bytes) -> bytes:
+    """Prefix a payload with its length"""
+    return FRAME_HEADER.pack(len(payload)) + payload
+
+
+async def read_frame(reader: asyncio.StreamReader) -> bytes:
+    """Read one length-prefixed payload"""
+    header = await reader.readexactly(FRAME_HEADER.size)
+    return await reader.readexactly(FRAME_HEADER.unpack(header)[0])
+
+
+class HostedMatch:
+    def __init__(self, match_id: int, vs_ai: bool, rollback: bool = False):
+        """
+        A match on the server together with its connected players.
+        Rollback matches are simulated by the players themselves; the
+        server only relays their inputs.
+        """
+        self.match_id = match_id
+        self.match = Match(ai2=AI() if vs_ai else None)
+        self.writers: Dict[int, asyncio.StreamWriter] = {}
+        self.moves = {1: 0, 2: 0}
+        self.last_state: Optional[Tuple[int, ...]] = None
+        self.vs_ai = vs_ai and not rollback
+        self.rollback = rollback
+        self.seed = random.getrandbits(32)
+        # Relayed inputs for a player who has not joined yet
+        self.pending: Dict[int, list] = {1: [], 2: []}
+        self.last_input_tick = {1: -1, 2: -1}
+
+    @property
+    def ready(self) -> bool:
+        """Whether every human seat is taken"""
+        return len(self.writers) == (1 if self.vs_ai else 2)
+
+    def free_seat(self) -> Optional[int]:
+        """Get a player number nobody uses yet"""
+        seats = (1,) if self.vs_ai else (1, 2)
+        for player in seats:
+            if player not in self.writers:
+                return player
+        return None
+
+
+class GameServer:
+    def __init__(self, host: str = NET_HOST, port: int = NET_PORT,
+                 tick_rate: int = NET_TICK_RATE):
+        """Authoritative server hosting any number of matches on one event loop"""
+        self.host = host
+        self.port = port
+        self.tick_rate = tick_rate
+        self.matches: Dict[int, HostedMatch] = {}
+        self.server: Optional[asyncio.AbstractServer] = None
+        self.handlers = set()
+        self.bytes_sent = 0
+        self.slow_clients = 0
+
+    async def start(self) -> None:
+        """Start accepting players and ticking matches"""
+        self.server = await asyncio.start_server(self._handle_client, self.host, self.port)
+        self.port = self.server.sockets[0].getsockname()[1]
+        self.ticker = asyncio.create_task(self._tick_loop())
+
+    async def stop(self) -> None:
+        """Stop the server and disconnect everybody"""
+        self.ticker.cancel()
+        self.server.close()
+        for hosted in list(self.matches.values()):
+            for writer in list(hosted.writers.values()):
+                writer.close()
+        # Closing the connections ends every handler at its next read
+        await asyncio.gather(*self.handlers, return_exceptions=True)
+        await self.server.wait_closed()
+
+    async def _handle_client(self, reader: asyncio.StreamReader,
+                             writer: asyncio.StreamWriter) -> None:
+        """Seat a player in the requested match, then read their inputs"""
+        hosted = None
+        player = None
+        task = asyncio.current_task()
+        self.handlers.add(task)
+        try:
+            payload = await read_frame(reader)
+            _, match_id, flags = JOIN.unpack(payload)
+
+            hosted = self.matches.get(match_id)
+            if hosted is None or hosted.match.game_over:
+                hosted = self.matches[match_id] = HostedMatch(
+                    match_id, bool(flags & JOIN_VS_AI), bool(flags & JOIN_ROLLBACK))
+            player = hosted.free_seat()
+            if player is None:
+                writer.close()
+                return
+
+            hosted.writers[player] = writer
+            self._send(writer, frame(WELCOME.pack(MSG_WELCOME, match_id, player,
+                                                  self.tick_rate, hosted.seed)))
+            for message in hosted.pending[player]:
+                self._send(writer, message)
+            hosted.pending[player].clear()
+            # Late joiners get every field; everyone else only receives deltas
+            self._send(writer, frame(encode_state(hosted.match.tick, quantize(hosted.match))))
+
+            while True:
+                payload = await read_frame(reader)
+                if payload[0] == MSG_INPUT:
+                    _, tick, move = INPUT.unpack(payload)
+                    if hosted.rollback:
+                        # Relay each tick once; duplicates would pile up in pending
+                        if tick <= hosted.last_input_tick[player]:
+                            continue
+                        hosted.last_input_tick[player] = tick
+                        message = frame(INPUT.pack(MSG_PEER_INPUT, tick, move))
+                        peer = hosted.writers.get(3 - player)
+                        if peer is not None:
+                            self._send(peer, message)
+                        else:
+                            hosted.pending[3 - player].append(message)
+                    else:
+                        hosted.moves[player] = move
+        except (asyncio.IncompleteReadError, ConnectionError, struct.error, IndexError):
+            pass  # Disconnected, or sent a malformed (e.g. empty) frame
+        finally:
+            if hosted is not None and hosted.writers.get(player) is writer:
+                del hosted.writers[player]
+                if not hosted.writers:
+                    self.matches.pop(hosted.match_id, None)
+            writer.close()
+            self.handlers.discard(task)
+
+    async def _tick_loop(self) -> None:
+        """Advance every ready match once per tick and send state deltas"""
+        loop = asyncio.get_running_loop()
+        interval = 1.0 / self.tick_rate
+        next_tick = loop.time()
+        while True:
+            for hosted in list(self.matches.values()):
+                if hosted.ready and not hosted.rollback and not hosted.match.game_over:
+                    self._tick_match(hosted)
+
+            next_tick += interval
+            delay = next_tick - loop.time()
+            if delay < 0:
+                next_tick = loop.time()  # Overloaded; do not try to catch up
+            await asyncio.sleep(max(0.0, delay))
+
+    def _tick_match(self, hosted: HostedMatch) -> None:
+        """Step one match and broadcast what changed"""
+        match = hosted.match
+        match.step(hosted.moves[1], hosted.moves[2])
+
+        state = quantize(match)
+        if state == hosted.last_state:
+            return
+        message = frame(encode_state(match.tick, state, hosted.last_state))
+        hosted.last_state = state
+        for writer in list(hosted.writers.values()):
+            self._send(writer, message)
+
+    def _send(self, writer: asyncio.StreamWriter, message: bytes) -> None:
+        """
+        Queue a message for a client, disconnecting clients that stopped
+        reading instead of buffering for them without limit
+        """
+        if writer.is_closing():
+            return
+        if writer.transport.get_write_buffer_size() > NET_MAX_WRITE_BUFFER:
+            self.slow_clients += 1
+            writer.close()  # Ends the client's handler at its next read
+            return
+        writer.write(message)
+        self.bytes_sent += len(message)
+
+
+class GameClient:
+    def __init__(self):
+        """Connection to a GameServer, keeping the latest dequantized state"""
+        self.state: Dict[str, float] = {name: 0.0 for name, _, _ in STATE_FIELDS}
+        self.tick = 0
+        self.player = 0
+        self.tick_rate = NET_TICK_RATE
+        self.seed = 0
+        self.connected = False
+        self.last_move = 0
+        self.on_peer_input: Optional[Callable[[int, int], None]] = None
+
+    async def connect(self, host: str = NET_HOST, port: int = NET_PORT,
+                      match_id: int = 0, vs_ai: bool = False, rollback: bool = False) -> None:
+        """Join a match and start receiving state"""
+        flags = (JOIN_VS_AI if vs_ai else 0) | (JOIN_ROLLBACK if rollback else 0)
+        self.reader, self.writer = await asyncio.open_connection(host, port)
+        self.writer.write(frame(JOIN.pack(MSG_JOIN, match_id, flags)))
+        _, _, self.player, self.tick_rate, self.seed = WELCOME.unpack(
+            await read_frame(self.reader))
+        self.connected = True
+        self.receiver = asyncio.create_task(self._receive())
+
+    async def _receive(self) -> None:
+        """Apply incoming state deltas until the connection closes"""
+        try:
+            while True:
+                payload = await read_frame(self.reader)
+                if payload[0] == MSG_STATE:
+                    self.tick = decode_state(payload, self.state)
+                elif payload[0] == MSG_PEER_INPUT and self.on_peer_input is not None:
+                    _, tick, move = INPUT.unpack(payload)
+                    self.on_peer_input(tick, move)
+        except (asyncio.IncompleteReadError, ConnectionError, struct.error, IndexError):
+            pass
+        finally:
+            self.connected = False
+
+    def send_move(self, move: int) -> None:
+        """Send the paddle move (1 down, -1 up, 0 none) when it changes"""
+        if move != self.last_move:
+            self.last_move = move
+            self.writer.write(frame(INPUT.pack(MSG_INPUT, self.tick, move)))
+
+    def send_input(self, tick: int, move: int) -> None:
+        """Send the move for a specific tick (rollback matches)"""
+        self.writer.write(frame(INPUT.pack(MSG_INPUT, tick, move)))
+
+    async def close(self) -> None:
+        """Disconnect from the server"""
+        self.receiver.cancel()
+        self.writer.close()
+
+
+def match_state(match: Match) -> Dict[str, float]:
+    """Get the state of a local Match in the same form as GameClient.state"""
+    return {"ball_x": match.ball.x, "ball_y": match.ball.y,
+            "speed_x": match.ball.speed_x, "speed_y": match.ball.speed_y,
+            "paddle1_y": match.paddle1.y, "paddle2_y": match.paddle2.y,
+            "score1": match.score1, "score2": match.score2, "winner": match.winner or 0}
+
+
+def apply_state(game, state: Dict[str, float]) -> None:
+    """Copy a network state into a local Game so that Game.draw can render it"""
+    game.ball.x = state["ball_x"]
+    game.ball.y = state["ball_y"]
+    game.paddle1.y = state["paddle1_y"]
+    game.paddle2.y = state["paddle2_y"]
+    game.paddle1.update()
+    game.paddle2.update()
+    game.score1 = int(state["score1"])
+    game.score2 = int(state["score2"])
+    game.winner = int(state["winner"]) or None
+    game.game_over = game.winner is not None
+
+
+async def run_client(host: str = NET_HOST, port: int = NET_PORT, match_id: int = 0,
+                     vs_ai: bool = False, rollback: bool = False) -> None:
+    """
+    Play a networked match, rendering it with Game.draw.
+    Without rollback the server state is shown as it arrives; with rollback
+    the match is simulated locally and the remote paddle is predicted.
+    """
+    pygame.init()
+    # The ball position comes from the network, which needs settable float coordinates
+    game = Game(physics=PHYSICS_FLOAT)
+    client = GameClient()
+    await client.connect(host, port, match_id, vs_ai, rollback)
+    pygame.display.set_caption(f"LollmsPong - Player {client.player}")
+
+    session = None
+    if rollback:
+        session = RollbackSession(client.player, client.seed)
+        client.on_peer_input = session.add_remote_input
+
+    running = True
+    while running and client.connected:
+        for event in pygame.event.get():
+            if event.type == pygame.QUIT:
+                running = False
+            elif event.type == pygame.VIDEORESIZE:
+                game.handle_event(event)
+
+        keys = pygame.key.get_pressed()
+        up = keys[pygame.K_w] or keys[pygame.K_UP]
+        down = keys[pygame.K_s] or keys[pygame.K_DOWN]
+        move = 1 if down and not up else -1 if up and not down else 0
+
+        if session is not None:
+            scheduled = session.add_local_input(move)
+            if scheduled is not None:
+                client.send_input(*scheduled)
+            session.advance()
+            apply_state(game, match_state(session.match))
+        else:
+            client.send_move(move)
+            apply_state(game, client.state)
+        game.draw()
+        await asyncio.sleep(1.0 / FPS)
+
+    if session is not None:
+        for name, value in session.report().items():
+            print(f"{name}: {value}")
+    await client.close()
+    pygame.quit()
+
+
+async def serve(host: str = NET_HOST, port: int = NET_PORT,
+                tick_rate: int = NET_TICK_RATE) -> None:
+    """Run a server until cancelled"""
+    server = GameServer(host, port, tick_rate)
+    await server.start()
+    print(f"Serving on {server.host}:{server.port} at {tick_rate} ticks per second")
+    try:
+        await asyncio.Event().wait()
+    finally:
+        await server.stop()
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Networked LollmsPong")
+    parser.add_argument("mode", choices=("server", "client"))
+    parser.add_argument("--host", default=NET_HOST)
+    parser.add_argument("--port", type=int, default=NET_PORT)
+    parser.add_argument("--tick-rate", type=int, default=NET_TICK_RATE)
+    parser.add_argument("--match", type=int, default=0)
+    parser.add_argument("--ai", action="store_true", help="play against the server AI")
+    parser.add_argument("--rollback", action="store_true",
+                        help="simulate locally with rollback instead of showing server state")
+    args = parser.parse_args()
+
+    if args.mode == "server":
+        asyncio.run(serve(args.host, args.port, args.tick_rate))
+    else:
+        asyncio.run(run_client(args.host, args.port, args.match, args.ai, args.rollback))
@@ -0,0 +1,143 @@
+import time
+from typing import Dict, Optional, Tuple
+from .constants import ROLLBACK_INPUT_DELAY, ROLLBACK_WINDOW, PHYSICS_FIXED
+from .match import Match
+from .timing import RunningStats
+
+
+class RollbackSession:
+    def __init__(self, local_player: int, seed: int,
+                 input_delay: int = ROLLBACK_INPUT_DELAY, window: int = ROLLBACK_WINDOW):
+        """
+        Peer-side simulation of a two-player match with rollback.
+        Local input is applied input_delay ticks after it was read, the
+        remote paddle is predicted to repeat its last known move, and when
+        an input arrives that contradicts a prediction the match is restored
+        from a snapshot and re-simulated up to the present, within one call
+        to advance(). Both peers must use the same seed; physics is
+        fixed-point so that they stay bit-identical.
+        """
+        self.match = Match(seed=seed, physics=PHYSICS_FIXED)
+        self.local_player = local_player
+        self.input_delay = input_delay
+        self.window = window
+
+        # Inputs by tick; the first input_delay ticks have no input on either side
+        self.local_inputs: Dict[int, int] = {tick: 0 for tick in range(input_delay)}
+        self.remote_inputs: Dict[int, int] = {tick: 0 for tick in range(input_delay)}
+        self.confirmed = input_delay - 1   # Every remote input up to here is known
+        self.last_local_move = 0
+
+        # State before each unconfirmed tick, and the remote move it assumed
+        self.snapshots: Dict[int, Tuple] = {}
+        self.assumed: Dict[int, int] = {}
+        self.rollback_from: Optional[int] = None
+
+        # Metrics
+        self.rollbacks = 0
+        self.mispredictions = 0
+        self.stalls = 0
+        self.rollback_depth = RunningStats()
+        self.resimulation_ms = RunningStats()
+
+    @property
+    def tick(self) -> int:
+        """Index of the next tick to simulate"""
+        return self.match.tick
+
+    def add_local_input(self, move: int) -> Optional[Tuple[int, int]]:
+        """
+        Schedule a local move
+        Returns: (tick, move) to send to the remote peer, or None when the
+        input for that tick was already scheduled (the session is stalled)
+        """
+        tick = self.match.tick + self.input_delay
+        if tick in self.local_inputs:
+            return None
+        self.local_inputs[tick] = move
+        return tick, move
+
+    def add_remote_input(self, tick: int, move: int) -> None:
+        """Record a move received from the remote peer"""
+        if tick in self.remote_inputs or tick <= self.confirmed:
+            return
+        self.remote_inputs[tick] = move
+        while self.confirmed + 1 in self.remote_inputs:
+            self.confirmed += 1
+
+        # A tick that was already simulated with a wrong guess must be redone
+        if tick in self.assumed and self.assumed[tick] != move:
+            self.mispredictions += 1
+            if self.rollback_from is None or tick < self.rollback_from:
+                self.rollback_from = tick
+
+    def advance(self) -> bool:
+        """
+        Simulate the next tick, rolling back first if needed
+        Returns: False when the match is over or waiting on the remote peer
+        """
+        if self.rollback_from is not None:
+            self._rollback()
+        self._forget_confirmed()
+
+        if self.match.game_over:
+            return False
+        if self.match.tick - self.confirmed > self.window:
+            # Too far ahead of the remote peer to roll back safely
+            self.stalls += 1
+            return False
+
+        self._simulate(self.match.tick)
+        return True
+
+    def _simulate(self, tick: int) -> None:
+        """Step the match through tick with known or predicted inputs"""
+        local_move = self.local_inputs.get(tick, self.last_local_move)
+        self.last_local_move = local_move
+
+        remote_move = self.remote_inputs.get(tick)
+        if remote_move is None:
+            remote_move = self.remote_inputs[self.confirmed]
+        self.snapshots[tick] = self.match.save_state()
+        self.assumed[tick] = remote_move
+
+        if self.local_player == 1:
+            self.match.step(local_move, remote_move)
+        else:
+            self.match.step(remote_move, local_move)
+
+    def _rollback(self) -> None:
+        """Restore the first mispredicted tick and re-simulate to the present"""
+        start = time.perf_counter()
+        first, current = self.rollback_from, self.match.tick
+        self.rollback_from = None
+
+        self.match.load_state(self.snapshots[first])
+        self.last_local_move = self.local_inputs.get(first - 1, 0)
+        for tick in range(first, current):
+            self._simulate(tick)
+
+        self.rollbacks += 1
+        self.rollback_depth.add(current - first)
+        self.resimulation_ms.add((time.perf_counter() - start) * 1000)
+
+    def _forget_confirmed(self) -> None:
+        """Drop snapshots and inputs that can no longer be rolled back to"""
+        for tick in [tick for tick in self.snapshots if tick <= self.confirmed]:
+            del self.snapshots[tick]
+            del self.assumed[tick]
+            self.local_inputs.pop(tick - 1, None)
+            self.remote_inputs.pop(tick - 1, None)
+
+    def report(self) -> Dict[str, float]:
+        """Get rollback metrics"""
+        return {
+            "ticks": self.match.tick,
+            "rollbacks": self.rollbacks,
+            "mispredictions": self.mispredictions,
+            "stalls": self.stalls,
+            "rollback_depth_avg": self.rollback_depth.mean,
+            "rollback_depth_max": self.rollback_depth.max,
+            "resimulation_ms_avg": self.resimulation_ms.mean,
+            "resimulation_ms_max": self.resimulation_ms.max,
+        }
@@ -0,0 +1,322 @@
+import argparse
+import asyncio
+import heapq
+import random
+import time
+from collections import deque
+from typing import AsyncIterator, Callable, Deque, Dict, List, Optional, Tuple
+from .constants import (PHYSICS_FIXED, SCHEDULER_QUANTUM, SCHEDULER_SLICE_MS,
+                        SCHEDULER_MAX_MATCHES, SCHEDULER_EVENT_BACKLOG)
+from .ai import AI
+from .match import Match
+from .timing import RunningStats
+
+
+class ScheduledMatch:
+    def __init__(self, match_id: int, match: Match, tick_rate: Optional[float],
+                 backlog: Optional[int]):
+        """
+        A match hosted by a MatchHost, with its pacing and metrics.
+        tick_rate: ticks per second, or None to run as fast as possible
+        backlog: unread events allowed before the match is held back,
+                 or None to not keep events at all
+        """
+        self.match_id = match_id
+        self.match = match
+        self.tick_rate = tick_rate
+        self.backlog = backlog
+        self.events: Deque[Dict] = deque()
+        self.readable = asyncio.Event()
+        self.done: asyncio.Future = asyncio.get_running_loop().create_future()
+        if backlog is not None:
+            match.on_event = self._on_event
+
+        self.started = time.perf_counter()
+        self.finished: Optional[float] = None
+
+        # Metrics
+        self.turns = 0
+        self.held_back = 0
+        self.step_us = RunningStats()
+        self.lag_ms = RunningStats()
+
+    def _on_event(self, event: Dict) -> None:
+        self.events.append(event)
+        self.readable.set()
+
+    @property
+    def blocked(self) -> bool:
+        """Whether too many events are waiting to be read"""
+        return self.backlog is not None and len(self.events) >= self.backlog
+
+    def due(self) -> float:
+        """Time at which the next tick should run"""
+        return self.started + (self.match.tick + 1) / self.tick_rate
+
+    async def stream(self) -> AsyncIterator[Dict]:
+        """Yield the match events as they happen, until the match is over"""
+        while True:
+            while self.events:
+                yield self.events.popleft()
+            if self.done.done():
+                return
+            self.readable.clear()
+            waiter = asyncio.ensure_future(self.readable.wait())
+            await asyncio.wait([waiter, self.done], return_when=asyncio.FIRST_COMPLETED)
+            waiter.cancel()
+
+    def report(self) -> Dict[str, float]:
+        """Get per-match metrics"""
+        elapsed = (self.finished or time.perf_counter()) - self.started
+        return {
+            "match_id": self.match_id,
+            "ticks": self.match.tick,
+            "ticks_per_second": self.match.tick / elapsed if elapsed > 0 else 0.0,
+            "turns": self.turns,
+            "held_back": self.held_back,
+            "step_us_avg": self.step_us.mean,
+            "step_us_max": self.step_us.max,
+            "lag_ms_avg": self.lag_ms.mean,
+            "lag_ms_max": self.lag_ms.max,
+            "winner": self.match.winner or 0,
+        }
+
+
+class MatchHost:
+    def __init__(self, quantum: int = SCHEDULER_QUANTUM, slice_ms: float = SCHEDULER_SLICE_MS,
+                 max_matches: int = SCHEDULER_MAX_MATCHES,
+                 backlog: int = SCHEDULER_EVENT_BACKLOG,
+                 on_finish: Optional[Callable[[ScheduledMatch], None]] = None):
+        """
+        Run many headless matches cooperatively on the current event loop.
+        Runnable matches take turns round-robin, each running at most
+        quantum ticks per turn. The loop is yielded to other tasks every
+        slice_ms, so sockets and timers stay responsive under load.
+        Real-time matches sleep in a timer heap until their next tick is due.
+        Matches whose events are not being read are held back until the
+        reader catches up, once backlog events are waiting. add() waits
+        while max_matches are running.
+        """
+        self.quantum = quantum
+        self.slice = slice_ms / 1000.0
+        self.max_matches = max_matches
+        self.backlog = backlog
+        self.on_finish = on_finish
+
+        self.matches: Dict[int, ScheduledMatch] = {}
+        self.ready: Deque[ScheduledMatch] = deque()
+        self.sleeping: List[Tuple[float, int, ScheduledMatch]] = []
+        self.blocked: List[ScheduledMatch] = []
+        self.next_id = 0
+        self.running = False
+        self.wakeup: Optional[asyncio.Event] = None
+        self.capacity: Optional[asyncio.Condition] = None
+
+        # Metrics
+        self.started = 0.0
+        self.total_ticks = 0
+        self.finished = 0
+        self.slices = 0
+        self.slice_ms = RunningStats()
+        self.step_us = RunningStats()
+        self.lag_ms = RunningStats()
+
+    def _ensure_primitives(self) -> None:
+        """Create the asyncio primitives inside the running loop"""
+        if self.wakeup is None:
+            self.wakeup = asyncio.Event()
+            self.capacity = asyncio.Condition()
+
+    async def add(self, match: Match, tick_rate: Optional[float] = None,
+                  keep_events: bool = False) -> ScheduledMatch:
+        """
+        Host a match, waiting while the host is full
+        tick_rate: ticks per second, or None to run as fast as possible
+        keep_events: collect the match events for ScheduledMatch.stream()
+        """
+        self._ensure_primitives()
+        async with self.capacity:
+            await self.capacity.wait_for(lambda: len(self.matches) < self.max_matches)
+            scheduled = ScheduledMatch(self.next_id, match, tick_rate,
+                                       self.backlog if keep_events else None)
+            self.next_id += 1
+            self.matches[scheduled.match_id] = scheduled
+            self.ready.append(scheduled)
+            self.wakeup.set()
+        return scheduled
+
+    async def add_ai_match(self, seed: Optional[int] = None, difficulty1: str = "MEDIUM",
+                           difficulty2: str = "MEDIUM", tick_rate: Optional[float] = None,
+                           keep_events: bool = False) -> ScheduledMatch:
+        """Host an AI-vs-AI match with fixed-point physics, reproducible from seed"""
+        rng = random.Random(seed)
+        match = Match(AI(difficulty1, rng=random.Random(rng.getrandbits(32))),
+                      AI(difficulty2, rng=random.Random(rng.getrandbits(32))),
+                      seed=rng.getrandbits(32), physics=PHYSICS_FIXED)
+        return await self.add(match, tick_rate, keep_events)
+
+    def _turn(self, scheduled: ScheduledMatch, now: float) -> None:
+        """Run one scheduling turn of a match"""
+        match = scheduled.match
+        ticks = self.quantum
+        if scheduled.tick_rate is not None:
+            due = int((now - scheduled.started) * scheduled.tick_rate) - match.tick
+            ticks = min(ticks, due)
+            if ticks > 0:
+                lag = (now - scheduled.due()) * 1000
+                scheduled.lag_ms.add(lag)
+                self.lag_ms.add(lag)
+        if ticks <= 0:
+            return
+
+        start = time.perf_counter()
+        stepped = 0
+        while stepped < ticks and not match.game_over and not scheduled.blocked:
+            match.step()
+            stepped += 1
+        if stepped:
+            step_us = (time.perf_counter() - start) * 1e6 / stepped
+            scheduled.step_us.add(step_us)
+            self.step_us.add(step_us)
+            self.total_ticks += stepped
+        scheduled.turns += 1
+
+    def _place(self, scheduled: ScheduledMatch, now: float) -> None:
+        """Queue a match after its turn according to what it waits for"""
+        if scheduled.match.game_over:
+            self._finish(scheduled)
+        elif scheduled.blocked:
+            scheduled.held_back += 1
+            self.blocked.append(scheduled)
+        elif scheduled.tick_rate is not None and scheduled.due() > now:
+            heapq.heappush(self.sleeping,
+                           (scheduled.due(), scheduled.match_id, scheduled))
+        else:
+            self.ready.append(scheduled)
+
+    def _finish(self, scheduled: ScheduledMatch) -> None:
+        """Retire a finished match and free its seat"""
+        scheduled.finished = time.perf_counter()
+        del self.matches[scheduled.match_id]
+        self.finished += 1
+        scheduled.done.set_result(scheduled.match.winner)
+        if self.on_finish is not None:
+            self.on_finish(scheduled)
+        asyncio.ensure_future(self._release())
+
+    async def _release(self) -> None:
+        async with self.capacity:
+            self.capacity.notify_all()
+
+    def _wake(self, now: float) -> None:
+        """Move matches whose tick is due or whose reader caught up to the ready queue"""
+        while self.sleeping and self.sleeping[0][0] <= now:
+            self.ready.append(heapq.heappop(self.sleeping)[2])
+        if self.blocked:
+            still_blocked = []
+            for scheduled in self.blocked:
+                (still_blocked if scheduled.blocked else self.ready).append(scheduled)
+            self.blocked = still_blocked
+
+    async def run(self, until_idle: bool = False) -> None:
+        """
+        Schedule matches until stop() is called
+        until_idle: return once no match is left
+        """
+        self._ensure_primitives()
+        self.running = True
+        self.started = time.perf_counter()
+        while self.running:
+            now = time.perf_counter()
+            self._wake(now)
+
+            if not self.ready:
+                if until_idle and not self.matches:
+                    break
+                # Nothing runnable: sleep until the next tick is due or a match is added
+                self.wakeup.clear()
+                timeout = self.sleeping[0][0] - now if self.sleeping else None
+                if self.blocked:
+                    timeout = min(timeout or self.slice, self.slice)
+                try:
+                    await asyncio.wait_for(self.wakeup.wait(), timeout)
+                except asyncio.TimeoutError:
+                    pass
+                continue
+
+            # One slice: give each ready match a turn until the slice is used up
+            slice_start = now
+            for _ in range(len(self.ready)):
+                scheduled = self.ready.popleft()
+                self._turn(scheduled, now)
+                now = time.perf_counter()
+                self._place(scheduled, now)
+                if now - slice_start >= self.slice:
+                    break
+            self.slices += 1
+            self.slice_ms.add((now - slice_start) * 1000)
+            await asyncio.sleep(0)
+        self.running = False
+
+    def stop(self) -> None:
+        """Make run() return after the current slice"""
+        self.running = False
+        if self.wakeup is not None:
+            self.wakeup.set()
+
+    def report(self) -> Dict[str, float]:
+        """Get host-wide metrics"""
+        elapsed = time.perf_counter() - self.started
+        return {
+            "running": len(self.matches),
+            "finished": self.finished,
+            "ticks": self.total_ticks,
+            "ticks_per_second": self.total_ticks / elapsed if elapsed > 0 else 0.0,
+            "slices": self.slices,
+            "slice_ms_avg": self.slice_ms.mean,
+            "slice_ms_max": self.slice_ms.max,
+            "step_us_avg": self.step_us.mean,
+            "lag_ms_avg": self.lag_ms.mean,
+            "lag_ms_max": self.lag_ms.max,
+        }
+
+
+async def load_test(matches: int, tick_rate: Optional[float], duration: float,
+                    seed: int = 0) -> Dict[str, float]:
+    """
+    Keep matches AI-vs-AI matches running for duration seconds, replacing
+    each finished match with a new one, and report host metrics
+    """
+    host = MatchHost(max_matches=matches)
+    scheduler = asyncio.ensure_future(host.run())
+    end = time.perf_counter() + duration
+    next_seed = seed
+
+    async def refill() -> None:
+        nonlocal next_seed
+        while time.perf_counter() < end:
+            await host.add_ai_match(next_seed, tick_rate=tick_rate)
+            next_seed += 1
+
+    filler = asyncio.ensure_future(refill())
+    while time.perf_counter() < end:
+        await asyncio.sleep(1.0)
+        print(", ".join(f"{name}: {value:.2f}" if isinstance(value, float)
+                        else f"{name}: {value}" for name, value in host.report().items()))
+
+    host.stop()
+    await scheduler
+    filler.cancel()
+    return host.report()
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Host many AI-vs-AI matches in one process")
+    parser.add_argument("--matches", type=int, default=1000, help="concurrent matches")
+    parser.add_argument("--tick-rate", type=float, default=60.0,
+                        help="ticks per second per match, 0 for as fast as possible")
+    parser.add_argument("--duration", type=float, default=10.0, help="seconds to run")
+    parser.add_argument("--seed", type=int, default=0)
+    args = parser.parse_args()
+
+    asyncio.run(load_test(args.matches, args.tick_rate or None, args.duration, args.seed))
@@ -0,0 +1,211 @@
+import multiprocessing
+import struct
+import sys
+from multiprocessing import resource_tracker, shared_memory
+from typing import Iterator, NamedTuple, Optional
+import pygame
+from .constants import *
+from .paddle import Paddle
+from .ball import Ball
+
+# Shared memory layout:
+#   header: number of states published so far
+#   slots:  sequence counter followed by one packed state
+# A writer makes a slot's counter odd while it fills the slot and even once
+# it is done, so readers can detect and retry torn reads (a seqlock).
+# Header and slots are padded to 64 bytes so that counters stay aligned.
+HEADER = struct.Struct("<Q56x")
+SEQUENCE = struct.Struct("<Q")
+STATE = struct.Struct("<qddddiiBB6x")
+SLOT_SIZE = SEQUENCE.size + STATE.size
+
+# Blocks created by publishers in this process
+_published_names = set()
+
+
+class BroadcastState(NamedTuple):
+    tick: int
+    ball_x: float
+    ball_y: float
+    paddle1_y: float
+    paddle2_y: float
+    score1: int
+    score2: int
+    paused: bool
+    game_over: bool
+
+
+def _attach(name: str) -> shared_memory.SharedMemory:
+    """Open an existing block without taking ownership of it"""
+    if sys.version_info >= (3, 13):
+        return shared_memory.SharedMemory(name, track=False)
+    shm = shared_memory.SharedMemory(name)
+    # Older Pythons register every attachment with the resource tracker,
+    # which would unlink the block when this process exits. The tracker is
+    # shared with the parent in child processes and with the publisher in
+    # its own process, so unregistering there would drop the publisher's
+    # registration; only a standalone spectator process owns its tracker.
+    if multiprocessing.parent_process() is None and shm._name not in _published_names:
+        resource_tracker.unregister(shm._name, "shared_memory")
+    return shm
+
+
+class StatePublisher:
+    def __init__(self, name: str = BROADCAST_NAME, slots: int = BROADCAST_SLOTS):
+        """
+        Publish per-tick game state into a shared memory ring.
+        Publishing is a few fixed-size writes; it does not know or care how
+        many spectators are reading.
+        """
+        self.slots = slots
+        self.shm = shared_memory.SharedMemory(name, create=True,
+                                              size=HEADER.size + slots * SLOT_SIZE)
+        self.buf = self.shm.buf
+        self.published = 0
+        _published_names.add(self.shm._name)
+        HEADER.pack_into(self.buf, 0, 0)
+
+    @property
+    def name(self) -> str:
+        return self.shm.name
+
+    def publish(self, state: BroadcastState) -> None:
+        """Write a state into the next slot"""
+        offset = HEADER.size + (self.published % self.slots) * SLOT_SIZE
+        sequence = SEQUENCE.unpack_from(self.buf, offset)[0]
+        SEQUENCE.pack_into(self.buf, offset, sequence + 1)
+        STATE.pack_into(self.buf, offset + SEQUENCE.size, *state)
+        SEQUENCE.pack_into(self.buf, offset, sequence + 2)
+
+        self.published += 1
+        HEADER.pack_into(self.buf, 0, self.published)
+
+    def close(self) -> None:
+        """Stop publishing and remove the shared memory block"""
+        self.buf.release()
+        self.shm.close()
+        self.shm.unlink()
+        _published_names.discard(self.shm._name)
+
+
+class StateSubscriber:
+    def __init__(self, name: str = BROADCAST_NAME):
+        """Read states published by a StatePublisher in another process"""
+        self.shm = _attach(name)
+        self.buf = self.shm.buf
+        self.slots = (self.shm.size - HEADER.size) // SLOT_SIZE
+        self.next_index = 0
+        self.missed = 0
+
+    def _read(self, index: int) -> Optional[BroadcastState]:
+        """Read state number index, or None if it was overwritten meanwhile"""
+        offset = HEADER.size + (index % self.slots) * SLOT_SIZE
+        while True:
+            before = SEQUENCE.unpack_from(self.buf, offset)[0]
+            if before % 2:
+                continue  # Writer is busy with this slot
+            state = BroadcastState._make(STATE.unpack_from(self.buf, offset + SEQUENCE.size))
+            if SEQUENCE.unpack_from(self.buf, offset)[0] == before:
+                break
+
+        # The writer reuses this slot for state index + slots as soon as
+        # index + slots states have been published
+        if HEADER.unpack_from(self.buf, 0)[0] - index >= self.slots:
+            return None
+        return state
+
+    def latest(self) -> Optional[BroadcastState]:
+        """Get the most recently published state"""
+        published = HEADER.unpack_from(self.buf, 0)[0]
+        if published == 0:
+            return None
+        return self._read(published - 1)
+
+    def updates(self) -> Iterator[BroadcastState]:
+        """Yield every state published since the previous call, oldest first"""
+        published = HEADER.unpack_from(self.buf, 0)[0]
+        oldest = published - self.slots + 1
+        if self.next_index < oldest:
+            self.missed += oldest - self.next_index
+            self.next_index = oldest
+        while self.next_index < published:
+            state = self._read(self.next_index)
+            self.next_index += 1
+            if state is None:
+                self.missed += 1
+            else:
+                yield state
+
+    def close(self) -> None:
+        """Detach from the shared memory block"""
+        self.buf.release()
+        self.shm.close()
+
+
+def run_spectator(name: str = BROADCAST_NAME) -> None:
+    """Open a window that renders a broadcast match with the game's own sprites"""
+    pygame.init()
+    screen = pygame.display.set_mode((WINDOW_WIDTH, WINDOW_HEIGHT))
+    pygame.display.set_caption("LollmsPong - Spectator")
+    clock = pygame.time.Clock()
+    font = pygame.font.Font(None, 74)
+
+    subscriber = StateSubscriber(name)
+    paddle1 = Paddle(50, 0, BLUE)
+    paddle2 = Paddle(WINDOW_WIDTH - 50 - PADDLE_WIDTH, 0, RED)
+    ball = Ball()
+    last_state = None
+
+    # Overlays are the same as in Game.draw, rendered once
+    pause_surf = font.render("PAUSED", True, WHITE)
+    winner_surfs = {player: font.render(f"Player {player} Wins!", True, WHITE)
+                    for player in (1, 2)}
+    score_surfs = {}
+
+    def render_score(score: int) -> pygame.Surface:
+        if score not in score_surfs:
+            score_surfs[score] = font.render(str(score), True, WHITE)
+        return score_surfs[score]
+
+    running = True
+    while running:
+        for event in pygame.event.get():
+            if event.type == pygame.QUIT:
+                running = False
+
+        # Pausing publishes a new state with the same tick, so compare it all
+        state = subscriber.latest()
+        if state is not None and state != last_state:
+            last_state = state
+            paddle1.y = state.paddle1_y
+            paddle2.y = state.paddle2_y
+            paddle1.update()
+            paddle2.update()
+            ball.x, ball.y = state.ball_x, state.ball_y
+
+            screen.fill(BLACK)
+            paddle1.draw(screen)
+            paddle2.draw(screen)
+            ball.draw(screen)
+            screen.blit(render_score(state.score1), (WINDOW_WIDTH//4, 20))
+            screen.blit(render_score(state.score2), (3*WINDOW_WIDTH//4, 20))
+            pygame.draw.aaline(screen, WHITE, (WINDOW_WIDTH//2, 0),
+                               (WINDOW_WIDTH//2, WINDOW_HEIGHT))
+
+            if state.paused:
+                screen.blit(pause_surf, (WINDOW_WIDTH//2 - pause_surf.get_width()//2,
+                                         WINDOW_HEIGHT//2))
+            if state.game_over:
+                winner_surf = winner_surfs[1 if state.score1 > state.score2 else 2]
+                screen.blit(winner_surf, (WINDOW_WIDTH//2 - winner_surf.get_width()//2,
+                                          WINDOW_HEIGHT//2))
+            pygame.display.flip()
+
+        clock.tick(FPS)
+
+    subscriber.close()
+    pygame.quit()
+
+
+if __name__ == "__main__":
+    run_spectator(sys.argv[1] if len(sys.argv) > 1 else BROADCAST_NAME)
@@ -0,0 +1,129 @@
+import math
+import time
+from typing import Callable, Dict, Optional
+from .constants import FPS, SPIN_TOLERANCE_MS
+
+# How often wait() polls for input while sleeping
+POLL_INTERVAL = 0.001
+
+
+class RunningStats:
+    def __init__(self):
+        """Track count, mean, deviation and maximum in constant memory"""
+        self.count = 0
+        self.mean = 0.0
+        self.m2 = 0.0
+        self.max = 0.0
+
+    def add(self, value: float) -> None:
+        """Add a sample using Welford's online update"""
+        self.count += 1
+        delta = value - self.mean
+        self.mean += delta / self.count
+        self.m2 += delta * (value - self.mean)
+        self.max = max(self.max, value)
+
+    def merge(self, other: "RunningStats") -> None:
+        """Combine with statistics gathered elsewhere (Chan et al.)"""
+        if other.count == 0:
+            return
+        count = self.count + other.count
+        delta = other.mean - self.mean
+        self.mean += delta * other.count / count
+        self.m2 += other.m2 + delta * delta * self.count * other.count / count
+        self.count = count
+        self.max = max(self.max, other.max)
+
+    @property
+    def stddev(self) -> float:
+        """Get the sample standard deviation"""
+        if self.count < 2:
+            return 0.0
+        return math.sqrt(self.m2 / (self.count - 1))
+
+
+class FramePacer:
+    def __init__(self, fps: int = FPS, spin_tolerance_ms: float = SPIN_TOLERANCE_MS):
+        """
+        Pace frames so that input is sampled as late as possible before the
+        physics step, instead of sleeping right after the flip
+        """
+        self.frame_time = 1.0 / fps
+        self.spin_tolerance = spin_tolerance_ms / 1000.0
+        self.next_deadline: Optional[float] = None
+        self.work_estimate = 0.0
+        self.last_present: Optional[float] = None
+        self.sample_time = 0.0
+
+        self.input_latency = RunningStats()
+        self.frame_interval = RunningStats()
+
+    def wait(self, poll: Optional[Callable[[], None]] = None) -> float:
+        """
+        Block until it is time to sample input for the next frame
+        poll: called about every POLL_INTERVAL while sleeping, so that input
+              can be timestamped when it arrives rather than when it is used
+        Returns: the timestamp at which input may be sampled
+        """
+        now = time.perf_counter()
+        if self.next_deadline is None:
+            self.next_deadline = now + self.frame_time
+
+        # Leave just enough time before the deadline to simulate and draw
+        wake_at = self.next_deadline - self.work_estimate
+
+        # Coarse sleep first, then spin for the last few milliseconds
+        sleep_until = wake_at - self.spin_tolerance
+        while True:
+            if poll is not None:
+                poll()
+            remaining = sleep_until - time.perf_counter()
+            if remaining <= 0:
+                break
+            time.sleep(min(remaining, POLL_INTERVAL) if poll is not None else remaining)
+        while time.perf_counter() < wake_at:
+            pass
+
+        self.sample_time = time.perf_counter()
+        return self.sample_time
+
+    def resume(self) -> None:
+        """Start pacing afresh after frames were not being presented (e.g. paused)"""
+        self.next_deadline = None
+        self.last_present = None
+
+    def frame_done(self, input_time: Optional[float] = None) -> None:
+        """
+        Record that the frame has been presented
+        input_time: timestamp of the oldest input event handled this frame
+        """
+        present_time = time.perf_counter()
+
+        # Smooth the sample-to-present cost, biased towards slow frames
+        work = present_time - self.sample_time
+        if work > self.work_estimate:
+            self.work_estimate = work
+        else:
+            self.work_estimate += (work - self.work_estimate) * 0.1
+        self.work_estimate = min(self.work_estimate, self.frame_time)
+
+        if input_time is not None:
+            self.input_latency.add(present_time - input_time)
+        if self.last_present is not None:
+            self.frame_interval.add(present_time - self.last_present)
+        self.last_present = present_time
+
+        self.next_deadline += self.frame_time
+        if self.next_deadline < present_time:
+            # Fell behind; resynchronize instead of bursting to catch up
+            self.next_deadline = present_time + self.frame_time
+
+    def report(self) -> Dict[str, float]:
+        """Get input latency and frame-time jitter in milliseconds"""
+        return {
+            "input_latency_avg_ms": self.input_latency.mean * 1000,
+            "input_latency_max_ms": self.input_latency.max * 1000,
+            "frame_time_avg_ms": self.frame_interval.mean * 1000,
+            "frame_time_jitter_ms": self.frame_interval.stddev * 1000,
+            "frame_time_max_ms": self.frame_interval.max * 1000,
+        }
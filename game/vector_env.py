@@ -0,0 +1,248 @@
+import math
+from typing import Dict, Optional, Tuple
+import numpy as np
+from .constants import (WINDOW_WIDTH, WINDOW_HEIGHT, PADDLE_WIDTH, PADDLE_HEIGHT,
+                        PADDLE_SPEED, BALL_SIZE, BALL_SPEED, WINNING_SCORE)
+
+# Actions for the controlled (left) paddle
+ACTION_STAY = 0
+ACTION_UP = 1
+ACTION_DOWN = 2
+
+# Paddle x positions, matching Game
+PADDLE1_X = 50
+PADDLE2_X = WINDOW_WIDTH - 50 - PADDLE_WIDTH
+
+# Grayscale intensities used when rasterizing
+PADDLE_SHADE = 200
+BALL_SHADE = 255
+
+# Extra frames kept in the stacking ring before it has to wrap around,
+# as a multiple of frame_stack
+STACK_HEADROOM_FACTOR = 2
+
+
+class VectorPongEnv:
+    def __init__(self, num_envs: int, obs_mode: str = "pixels",
+                 frame_size: Tuple[int, int] = (84, 84), frame_stack: int = 1,
+                 seed: Optional[int] = None, stack_headroom: Optional[int] = None):
+        """
+        Run num_envs Pong matches in lockstep with NumPy arrays.
+        The agent controls the left paddle, a tracking AI the right one.
+        obs_mode: 'pixels' for downsampled grayscale frames, 'state' for
+        normalized state vectors
+        stack_headroom: spare frames in the stacking ring (pixels only);
+        more headroom means fewer wrap-around copies but more memory.
+        Defaults to STACK_HEADROOM_FACTOR * frame_stack.
+        """
+        if obs_mode not in ("pixels", "state"):
+            raise ValueError(f"Unknown observation mode: {obs_mode}")
+
+        self.num_envs = num_envs
+        self.obs_mode = obs_mode
+        self.frame_height, self.frame_width = frame_size
+        self.frame_stack = frame_stack
+        self.rng = np.random.default_rng(seed)
+
+        # Match state, one entry per environment
+        self.ball_x = np.zeros(num_envs)
+        self.ball_y = np.zeros(num_envs)
+        self.speed_x = np.zeros(num_envs)
+        self.speed_y = np.zeros(num_envs)
+        self.paddle1_y = np.zeros(num_envs)
+        self.paddle2_y = np.zeros(num_envs)
+        self.score1 = np.zeros(num_envs, dtype=np.int32)
+        self.score2 = np.zeros(num_envs, dtype=np.int32)
+
+        # Preallocated output buffers
+        self.rewards = np.zeros(num_envs, dtype=np.float32)
+        self.dones = np.zeros(num_envs, dtype=bool)
+        self.state_obs = np.zeros((num_envs, 6), dtype=np.float32)
+
+        # Frames live in a ring with headroom; the stacked observation is a
+        # strided slice of it, so stacking never copies frames. Nothing is
+        # drawn in state mode, so none of this is allocated there.
+        self.frame_index = frame_stack - 1
+        if obs_mode == "pixels":
+            if stack_headroom is None:
+                stack_headroom = STACK_HEADROOM_FACTOR * frame_stack
+            ring_length = frame_stack - 1 + max(1, stack_headroom)
+            self.frames = np.zeros((num_envs, ring_length, self.frame_height,
+                                    self.frame_width), dtype=np.uint8)
+            self.row_coords = (np.arange(self.frame_height) + 0.5) * (WINDOW_HEIGHT / self.frame_height)
+            self.col_coords = (np.arange(self.frame_width) + 0.5) * (WINDOW_WIDTH / self.frame_width)
+            self.row_mask = np.zeros((num_envs, self.frame_height), dtype=bool)
+            self.col_mask = np.zeros((num_envs, self.frame_width), dtype=bool)
+            self.mask = np.zeros((num_envs, self.frame_height, self.frame_width), dtype=bool)
+        self.paddle1_x = np.full(num_envs, PADDLE1_X)
+        self.paddle2_x = np.full(num_envs, PADDLE2_X)
+
+    @property
+    def observation_shape(self) -> Tuple[int, ...]:
+        """Get the shape of the batched observation"""
+        if self.obs_mode == "state":
+            return (self.num_envs, 6)
+        if self.frame_stack == 1:
+            return (self.num_envs, self.frame_height, self.frame_width)
+        return (self.num_envs, self.frame_stack, self.frame_height, self.frame_width)
+
+    def reset(self) -> np.ndarray:
+        """Reset every environment and return the first observation"""
+        everything = np.ones(self.num_envs, dtype=bool)
+        self.score1[:] = 0
+        self.score2[:] = 0
+        self.paddle1_y[:] = WINDOW_HEIGHT // 2 - PADDLE_HEIGHT // 2
+        self.paddle2_y[:] = WINDOW_HEIGHT // 2 - PADDLE_HEIGHT // 2
+        self._reset_balls(everything)
+
+        if self.obs_mode == "pixels":
+            self._rasterize()
+            self._fill_stack(everything)
+        return self._observation()
+
+    def step(self, actions: np.ndarray) -> Tuple[np.ndarray, np.ndarray, np.ndarray, Dict]:
+        """
+        Advance every environment by one tick.
+        Finished matches are reset automatically; the returned observation
+        is then the first one of the new match.
+        actions: (num_envs,) for the left paddle, or (num_envs, 2) to also
+        drive the right paddle instead of the built-in AI
+        Returns: observations, rewards, dones, info
+        The observation is a view into internal buffers that is only valid
+        until the next call; copy it to keep it. Rewards, dones and info are
+        fresh arrays the caller may keep.
+        """
+        actions = np.asarray(actions)
+        if actions.ndim == 2:
+            self._move_paddles(self.paddle1_y, actions[:, 0])
+            self._move_paddles(self.paddle2_y, actions[:, 1])
+        else:
+            self._move_paddles(self.paddle1_y, actions)
+            self._move_paddles(self.paddle2_y, self._ai_actions())
+
+        self._move_balls()
+        self._collide(self.paddle1_y, PADDLE1_X, self.speed_x < 0)
+        self._collide(self.paddle2_y, PADDLE2_X, self.speed_x > 0)
+
+        # Scoring; the ball is out of bounds exactly as in Ball.is_out_of_bounds
+        player2_scored = self.ball_x < 0
+        player1_scored = self.ball_x > WINDOW_WIDTH - BALL_SIZE
+        scored = player1_scored | player2_scored
+        self.score1 += player1_scored
+        self.score2 += player2_scored
+        self.rewards[:] = player1_scored
+        self.rewards -= player2_scored
+
+        np.logical_or(self.score1 >= WINNING_SCORE, self.score2 >= WINNING_SCORE,
+                      out=self.dones)
+        info = {"score1": self.score1.copy(), "score2": self.score2.copy()}
+
+        self._reset_balls(scored)
+        if self.dones.any():
+            self.score1[self.dones] = 0
+            self.score2[self.dones] = 0
+            self.paddle1_y[self.dones] = WINDOW_HEIGHT // 2 - PADDLE_HEIGHT // 2
+            self.paddle2_y[self.dones] = WINDOW_HEIGHT // 2 - PADDLE_HEIGHT // 2
+
+        if self.obs_mode == "pixels":
+            self._advance_frame()
+            self._rasterize()
+            if self.dones.any():
+                self._fill_stack(self.dones)
+        return self._observation(), self.rewards.copy(), self.dones.copy(), info
+
+    def _reset_balls(self, which: np.ndarray) -> None:
+        """Serve the ball from the center for the selected environments, like Ball.reset"""
+        count = int(which.sum())
+        if count == 0:
+            return
+        self.ball_x[which] = WINDOW_WIDTH // 2
+        self.ball_y[which] = WINDOW_HEIGHT // 2
+        self.speed_x[which] = BALL_SPEED * self.rng.choice((-1.0, 1.0), count)
+        self.speed_y[which] = self.rng.uniform(-BALL_SPEED, BALL_SPEED, count)
+
+    def _move_paddles(self, paddle_y: np.ndarray, actions: np.ndarray) -> None:
+        """Apply Paddle.move_up/move_down for each environment"""
+        paddle_y -= PADDLE_SPEED * ((actions == ACTION_UP) & (paddle_y > 0))
+        paddle_y += PADDLE_SPEED * ((actions == ACTION_DOWN) &
+                                    (paddle_y < WINDOW_HEIGHT - PADDLE_HEIGHT))
+
+    def _ai_actions(self) -> np.ndarray:
+        """Track the ball with the right paddle while it is approaching"""
+        target = np.where(self.speed_x > 0, self.ball_y + BALL_SIZE / 2, WINDOW_HEIGHT / 2)
+        center = self.paddle2_y + PADDLE_HEIGHT / 2
+        actions = np.full(self.num_envs, ACTION_STAY)
+        actions[center < target - 10] = ACTION_DOWN
+        actions[center > target + 10] = ACTION_UP
+        return actions
+
+    def _move_balls(self) -> None:
+        """Apply Ball.move for each environment"""
+        self.ball_x += self.speed_x
+        self.ball_y += self.speed_y
+        walls = (self.ball_y <= 0) | (self.ball_y >= WINDOW_HEIGHT - BALL_SIZE)
+        self.speed_y[walls] *= -1
+
+    def _collide(self, paddle_y: np.ndarray, paddle_x: int, approaching: np.ndarray) -> None:
+        """Apply Ball.check_collision against one paddle for each environment"""
+        hit = (approaching &
+               (self.ball_x < paddle_x + PADDLE_WIDTH) & (self.ball_x + BALL_SIZE > paddle_x) &
+               (self.ball_y < paddle_y + PADDLE_HEIGHT) & (self.ball_y + BALL_SIZE > paddle_y))
+        if not hit.any():
+            return
+
+        relative_intersect_y = (paddle_y[hit] + PADDLE_HEIGHT / 2) - (self.ball_y[hit] + BALL_SIZE / 2)
+        normalized_intersect = relative_intersect_y / (PADDLE_HEIGHT / 2)
+        bounce_angle = normalized_intersect * (math.pi / 3)  # Max 60 degree bounce
+        self.speed_x[hit] *= -1.1
+        self.speed_y[hit] = -BALL_SPEED * np.sin(bounce_angle) * 1.1
+
+    def _advance_frame(self) -> None:
+        """Move to the next slot of the frame ring, wrapping when it is full"""
+        self.frame_index += 1
+        if self.frame_index == self.frames.shape[1]:
+            keep = self.frame_stack - 1
+            if keep:
+                self.frames[:, :keep] = self.frames[:, -keep:]
+            self.frame_index = keep
+
+    def _fill_stack(self, which: np.ndarray) -> None:
+        """Repeat the current frame across the whole stack for new matches"""
+        start = self.frame_index - self.frame_stack + 1
+        if start < self.frame_index:
+            self.frames[which, start:self.frame_index] = self.frames[which, self.frame_index, None]
+
+    def _rasterize(self) -> None:
+        """Draw paddles and ball straight into the current frame slot"""
+        frame = self.frames[:, self.frame_index]
+        frame.fill(0)
+        self._draw_rects(frame, self.paddle1_x, self.paddle1_y,
+                         PADDLE_WIDTH, PADDLE_HEIGHT, PADDLE_SHADE)
+        self._draw_rects(frame, self.paddle2_x, self.paddle2_y,
+                         PADDLE_WIDTH, PADDLE_HEIGHT, PADDLE_SHADE)
+        self._draw_rects(frame, self.ball_x, self.ball_y, BALL_SIZE, BALL_SIZE, BALL_SHADE)
+
+    def _draw_rects(self, frame: np.ndarray, x: np.ndarray, y: np.ndarray,
+                    width: int, height: int, shade: int) -> None:
+        """Fill one rectangle per environment, sampling pixel centers"""
+        np.logical_and(self.row_coords >= y[:, None], self.row_coords < (y + height)[:, None],
+                       out=self.row_mask)
+        np.logical_and(self.col_coords >= x[:, None], self.col_coords < (x + width)[:, None],
+                       out=self.col_mask)
+        np.logical_and(self.row_mask[:, :, None], self.col_mask[:, None, :], out=self.mask)
+        np.copyto(frame, shade, where=self.mask)
+
+    def _observation(self) -> np.ndarray:
+        """Build the observation for the configured mode"""
+        if self.obs_mode == "state":
+            self.state_obs[:, 0] = self.ball_x / WINDOW_WIDTH
+            self.state_obs[:, 1] = self.ball_y / WINDOW_HEIGHT
+            self.state_obs[:, 2] = self.speed_x / BALL_SPEED
+            self.state_obs[:, 3] = self.speed_y / BALL_SPEED
+            self.state_obs[:, 4] = self.paddle1_y / WINDOW_HEIGHT
+            self.state_obs[:, 5] = self.paddle2_y / WINDOW_HEIGHT
+            return self.state_obs
+
+        if self.frame_stack == 1:
+            return self.frames[:, self.frame_index]
+        return self.frames[:, self.frame_index - self.frame_stack + 1:self.frame_index + 1]
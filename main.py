@@ -16,6 +16,7 @@ BALL_SIZE = 15
 PADDLE_SPEED = 5
 BALL_SPEED = 7
 FPS = 60
+IDLE_TIMEOUT_MS = 500
 
 # Colors
 WHITE = (255, 255, 255)
@@ -48,8 +49,8 @@ class Paddle:
 
 class Ball:
     def __init__(self):
-        self.reset()
         self.rect = pygame.Rect(WINDOW_WIDTH//2, WINDOW_HEIGHT//2, BALL_SIZE, BALL_SIZE)
+        self.reset()
 
     def reset(self):
         self.rect.center = (WINDOW_WIDTH//2, WINDOW_HEIGHT//2)
@@ -112,6 +113,15 @@ class Game:
         self.clock = pygame.time.Clock()
         self.state = GameState.MENU
         self.font = pygame.font.Font(None, 36)
+
+        # Static texts are rendered once; scores are rendered on first use
+        self.title_surf = self.font.render("LOLLMS PONG", True, WHITE)
+        self.vs_player_surf = self.font.render("1. VS Player", True, WHITE)
+        self.vs_ai_surf = self.font.render("2. VS AI", True, WHITE)
+        self.winner_surfs = {player: self.font.render(f"{player} Wins!", True, WHITE)
+                             for player in ("Player 1", "Player 2")}
+        self.restart_surf = self.font.render("Press SPACE to restart", True, WHITE)
+        self.score_surfs = {}
         
         self.player1 = Paddle(50, WINDOW_HEIGHT//2 - PADDLE_HEIGHT//2, BLUE)
         self.player2 = Paddle(WINDOW_WIDTH - 50 - PADDLE_WIDTH, 
@@ -173,10 +183,15 @@ class Game:
             
         pygame.display.flip()
 
+    def render_score(self, score):
+        if score not in self.score_surfs:
+            self.score_surfs[score] = self.font.render(str(score), True, WHITE)
+        return self.score_surfs[score]
+
     def render_menu(self):
-        title = self.font.render("LOLLMS PONG", True, WHITE)
-        vs_player = self.font.render("1. VS Player", True, WHITE)
-        vs_ai = self.font.render("2. VS AI", True, WHITE)
+        title = self.title_surf
+        vs_player = self.vs_player_surf
+        vs_ai = self.vs_ai_surf
         
         self.screen.blit(title, (WINDOW_WIDTH//2 - title.get_width()//2, 200))
         self.screen.blit(vs_player, (WINDOW_WIDTH//2 - vs_player.get_width()//2, 300))
@@ -188,23 +203,33 @@ class Game:
         self.ball.draw(self.screen)
         
         # Draw scores
-        score1 = self.font.render(str(self.player1.score), True, WHITE)
-        score2 = self.font.render(str(self.player2.score), True, WHITE)
+        score1 = self.render_score(self.player1.score)
+        score2 = self.render_score(self.player2.score)
         self.screen.blit(score1, (WINDOW_WIDTH//4, 50))
         self.screen.blit(score2, (3*WINDOW_WIDTH//4, 50))
 
     def render_game_over(self):
         winner = "Player 1" if self.player1.score > self.player2.score else "Player 2"
-        text = self.font.render(f"{winner} Wins!", True, WHITE)
-        restart = self.font.render("Press SPACE to restart", True, WHITE)
+        text = self.winner_surfs[winner]
+        restart = self.restart_surf
         
         self.screen.blit(text, (WINDOW_WIDTH//2 - text.get_width()//2, 250))
         self.screen.blit(restart, (WINDOW_WIDTH//2 - restart.get_width()//2, 350))
 
     def run(self):
         running = True
+        drawn = False
         while running:
-            for event in pygame.event.get():
+            events = pygame.event.get()
+            if self.state != GameState.PLAYING and drawn and not events:
+                # Menu and game over screens are static: sleep until input
+                event = pygame.event.wait(IDLE_TIMEOUT_MS)
+                if event.type == pygame.NOEVENT:
+                    continue
+                events = [event]
+            drawn = True
+
+            for event in events:
                 if event.type == pygame.QUIT:
                     running = False
                 elif event.type == pygame.KEYDOWN:
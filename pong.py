@@ -17,6 +17,7 @@ BALL_SIZE = 15
 PADDLE_SPEED = 5
 BALL_SPEED = 7
 FPS = 60
+IDLE_TIMEOUT_MS = 500
 
 # Colors
 WHITE = (255, 255, 255)
@@ -187,31 +188,37 @@ class Game:
         
     def show_menu(self):
         font = pygame.font.Font(None, 74)
-        
+
+        # Nothing on the menu changes, so render it once
+        title = font.render("LOLLMS PONG", True, WHITE)
+        vs_player = font.render("1. VS Player", True, WHITE)
+        vs_ai = font.render("2. VS AI", True, WHITE)
+        redraw = True
+
         while True:
-            self.screen.fill(BLACK)
-            title = font.render("LOLLMS PONG", True, WHITE)
-            vs_player = font.render("1. VS Player", True, WHITE)
-            vs_ai = font.render("2. VS AI", True, WHITE)
-            
-            self.screen.blit(title, (WINDOW_WIDTH//2 - title.get_width()//2, 100))
-            self.screen.blit(vs_player, (WINDOW_WIDTH//2 - vs_player.get_width()//2, 250))
-            self.screen.blit(vs_ai, (WINDOW_WIDTH//2 - vs_ai.get_width()//2, 350))
-            
-            pygame.display.flip()
-            
-            for event in pygame.event.get():
-                if event.type == pygame.QUIT:
-                    return False
-                if event.type == pygame.KEYDOWN:
-                    if event.key == pygame.K_1:
-                        self.game_mode = GameMode.VS_PLAYER
-                        return True
-                    elif event.key == pygame.K_2:
-                        self.game_mode = GameMode.VS_AI
-                        self.ai = AI(AIDifficulty.MEDIUM)
-                        return True
-                        
+            if redraw:
+                self.screen.fill(BLACK)
+                self.screen.blit(title, (WINDOW_WIDTH//2 - title.get_width()//2, 100))
+                self.screen.blit(vs_player, (WINDOW_WIDTH//2 - vs_player.get_width()//2, 250))
+                self.screen.blit(vs_ai, (WINDOW_WIDTH//2 - vs_ai.get_width()//2, 350))
+                pygame.display.flip()
+                redraw = False
+
+            # Sleep until something happens instead of spinning
+            event = pygame.event.wait(IDLE_TIMEOUT_MS)
+            if event.type == pygame.QUIT:
+                return False
+            if event.type in (pygame.VIDEOEXPOSE, pygame.WINDOWEXPOSED):
+                redraw = True
+            if event.type == pygame.KEYDOWN:
+                if event.key == pygame.K_1:
+                    self.game_mode = GameMode.VS_PLAYER
+                    return True
+                elif event.key == pygame.K_2:
+                    self.game_mode = GameMode.VS_AI
+                    self.ai = AI(AIDifficulty.MEDIUM)
+                    return True
+
     def run(self):
         running = self.show_menu()
         
@@ -0,0 +1,84 @@
+import math
+import random
+from game.analytics import MatchAnalytics, QuantileDigest, analyze_files, read_events
+from game.match import record_matches
+from game.timing import RunningStats
+
+
+def chunks(values, sizes):
+    start = 0
+    for size in sizes:
+        yield values[start:start + size]
+        start += size
+
+
+def test_running_stats_merge_matches_single_stream():
+    rng = random.Random(1)
+    values = [rng.gauss(10, 3) for _ in range(5000)]
+    single = RunningStats()
+    for value in values:
+        single.add(value)
+
+    merged = RunningStats()
+    for chunk in chunks(values, (1, 999, 0, 2500, 1500)):
+        partial = RunningStats()
+        for value in chunk:
+            partial.add(value)
+        merged.merge(partial)
+
+    assert merged.count == single.count
+    assert math.isclose(merged.mean, single.mean, rel_tol=1e-9)
+    assert math.isclose(merged.stddev, single.stddev, rel_tol=1e-9)
+    assert merged.max == single.max
+
+
+def test_merged_digests_match_single_stream():
+    rng = random.Random(2)
+    values = [rng.expovariate(0.1) for _ in range(20000)]
+    single = QuantileDigest()
+    for value in values:
+        single.add(value)
+
+    merged = QuantileDigest()
+    for chunk in chunks(values, (3000, 7000, 10, 9990)):
+        partial = QuantileDigest()
+        for value in chunk:
+            partial.add(value)
+        merged.merge(partial)
+
+    exact = sorted(values)
+    for q in (0.01, 0.1, 0.5, 0.9, 0.99):
+        truth = exact[int(q * (len(exact) - 1))]
+        # Both estimates are within a small fraction of the rank of the truth
+        for digest in (single, merged):
+            estimate = digest.quantile(q)
+            rank = sum(1 for value in exact if value <= estimate) / len(exact)
+            assert abs(rank - q) < 0.01, (q, truth, estimate)
+    # Centroid count stays bounded however the digest was built
+    assert len(merged.means) <= 4 * single.compression
+
+
+def test_analyze_files_matches_single_stream(tmp_path):
+    files = []
+    for index in range(6):
+        filename = str(tmp_path / f"matches_{index}.jsonl")
+        record_matches(filename, 3, seed=index)
+        files.append(filename)
+
+    single = MatchAnalytics()
+    for filename in files:
+        single.add_events(read_events(filename))
+    merged = analyze_files(files, processes=2)
+
+    assert merged.matches == single.matches == 18
+    assert merged.points == single.points
+    assert merged.rally_lengths.counts == single.rally_lengths.counts
+    assert merged.hit_positions.counts == single.hit_positions.counts
+    assert merged.point_causes == single.point_causes
+    assert math.isclose(merged.rally_moments.mean, single.rally_moments.mean, rel_tol=1e-9)
+    assert math.isclose(merged.rally_moments.stddev, single.rally_moments.stddev, rel_tol=1e-9)
+    for mine, theirs in zip(merged.speed_curve, single.speed_curve):
+        assert mine.count == theirs.count
+        assert math.isclose(mine.mean, theirs.mean, rel_tol=1e-9, abs_tol=1e-12)
+    for q in (0.5, 0.9):
+        assert abs(merged.rally_quantiles.quantile(q) - single.rally_quantiles.quantile(q)) <= 1
@@ -0,0 +1,83 @@
+import random
+import numpy as np
+from game.constants import PHYSICS_FIXED, PADDLE_HEIGHT
+from game.ai import AI
+from game.fixed_physics import (FIXED_ONE, FixedBall, bounce_speed_y, collide_balls,
+                                move_balls, speed_up)
+from game.match import Match
+from game.paddle import Paddle
+
+
+def random_balls(rng, count, paddle):
+    """Balls scattered around a paddle with random velocities"""
+    balls = []
+    for _ in range(count):
+        ball = FixedBall()
+        ball.reset(rng)
+        ball.fx = (paddle.x + rng.randint(-20, 25)) * FIXED_ONE + rng.randrange(FIXED_ONE)
+        ball.fy = (paddle.y + rng.randint(-30, PADDLE_HEIGHT + 20)) * FIXED_ONE + rng.randrange(FIXED_ONE)
+        ball.fvx = rng.randint(-12 * FIXED_ONE, 12 * FIXED_ONE)
+        ball.fvy = rng.randint(-12 * FIXED_ONE, 12 * FIXED_ONE)
+        balls.append(ball)
+    return balls
+
+
+def as_arrays(balls):
+    return [np.array([getattr(ball, name) for ball in balls], dtype=np.int32)
+            for name in ("fx", "fy", "fvx", "fvy")]
+
+
+def test_bounce_is_symmetric_about_paddle_centre():
+    half_height = PADDLE_HEIGHT // 2 * FIXED_ONE
+    for relative_intersect in range(0, 2 * half_height, 7):
+        assert bounce_speed_y(relative_intersect, half_height) == \
+            -bounce_speed_y(-relative_intersect, half_height)
+    assert bounce_speed_y(0, half_height) == 0
+    for speed in range(0, 40 * FIXED_ONE, 13):
+        assert speed_up(speed) == -speed_up(-speed)
+
+
+def test_vector_collisions_match_scalar_ball():
+    rng = random.Random(7)
+    paddle = Paddle(50, 250)
+    balls = random_balls(rng, 20000, paddle)
+    x, y, vx, vy = as_arrays(balls)
+
+    expected_hits = [ball.check_collision(paddle) for ball in balls]
+    count = len(balls)
+    hits = collide_balls(x, y, vx, vy,
+                         np.full(count, paddle.x * FIXED_ONE, dtype=np.int32),
+                         np.full(count, paddle.y * FIXED_ONE, dtype=np.int32),
+                         paddle.width, paddle.height)
+
+    assert hits.tolist() == expected_hits
+    assert any(expected_hits) and not all(expected_hits)
+    assert vx.tolist() == [ball.fvx for ball in balls]
+    assert vy.tolist() == [ball.fvy for ball in balls]
+
+
+def test_vector_moves_match_scalar_ball():
+    rng = random.Random(8)
+    balls = random_balls(rng, 2000, Paddle(400, 300))
+    x, y, vx, vy = as_arrays(balls)
+    for _ in range(200):
+        for ball in balls:
+            ball.move()
+        move_balls(x, y, vx, vy)
+    assert x.tolist() == [ball.fx for ball in balls]
+    assert y.tolist() == [ball.fy for ball in balls]
+    assert vy.tolist() == [ball.fvy for ball in balls]
+
+
+def test_fixed_matches_are_bit_exact():
+    def play(seed):
+        match = Match(AI(rng=random.Random(seed)), AI(rng=random.Random(seed + 1)),
+                      seed=seed, physics=PHYSICS_FIXED)
+        trace = []
+        while not match.game_over and match.tick < 5000:
+            match.step()
+            trace.append((match.ball.fx, match.ball.fy, match.ball.fvx, match.ball.fvy,
+                          match.paddle1.y, match.paddle2.y))
+        return trace, match.winner
+
+    assert play(11) == play(11)
@@ -0,0 +1,112 @@
+import asyncio
+from game.constants import PHYSICS_FIXED
+from game.ai import AI
+from game.match import Match
+from game.net import (STATE_FIELDS, GameServer, GameClient, decode_state, encode_state,
+                      frame, quantize, JOIN, MSG_JOIN)
+
+
+def dequantize(state):
+    return {name: value / scale for (name, _, scale), value in zip(STATE_FIELDS, state)}
+
+
+def empty_state():
+    return {name: 0.0 for name, _, _ in STATE_FIELDS}
+
+
+async def wait_for(condition, timeout=5.0):
+    """Poll condition until it holds, failing after timeout seconds"""
+    loop = asyncio.get_running_loop()
+    deadline = loop.time() + timeout
+    while not condition():
+        assert loop.time() < deadline, "timed out"
+        await asyncio.sleep(0.01)
+
+
+def test_full_state_round_trip():
+    match = Match(AI(), AI(), seed=3, physics=PHYSICS_FIXED)
+    for _ in range(250):
+        match.step()
+    state = quantize(match)
+
+    decoded = empty_state()
+    assert decode_state(encode_state(match.tick, state), decoded) == match.tick
+    assert decoded == dequantize(state)
+
+
+def test_delta_round_trip():
+    match = Match(AI(), AI(), seed=4, physics=PHYSICS_FIXED)
+    previous = quantize(match)
+    decoded = empty_state()
+    decode_state(encode_state(match.tick, previous), decoded)
+
+    for _ in range(300):
+        match.step()
+        state = quantize(match)
+        delta = encode_state(match.tick, state, previous)
+        assert len(delta) <= len(encode_state(match.tick, state))
+        assert decode_state(delta, decoded) == match.tick
+        assert decoded == dequantize(state)
+        previous = state
+
+    # Unchanged fields are not sent at all
+    assert len(encode_state(match.tick, previous, previous)) < len(encode_state(0, previous))
+
+
+def test_join_welcome_and_late_joiner():
+    async def scenario():
+        server = GameServer(port=0, tick_rate=240)
+        await server.start()
+        try:
+            first, second = GameClient(), GameClient()
+            await first.connect(port=server.port, match_id=1)
+            await second.connect(port=server.port, match_id=1)
+            assert (first.player, second.player) == (1, 2)
+            assert first.seed == second.seed
+            assert first.tick_rate == 240
+
+            first.send_move(1)
+            await wait_for(lambda: first.tick > 30)
+            await second.close()
+            await wait_for(lambda: 2 not in server.matches[1].writers)
+
+            # The late joiner takes the free seat and gets every field at once
+            late = GameClient()
+            await late.connect(port=server.port, match_id=1)
+            assert late.player == 2
+            await wait_for(lambda: late.tick > 0)
+            await wait_for(lambda: late.tick == first.tick and late.state == first.state)
+            assert late.state["paddle1_y"] > 0
+            await first.close()
+            await late.close()
+        finally:
+            await server.stop()
+
+    asyncio.run(scenario())
+
+
+def test_malformed_frame_does_not_stop_server():
+    async def scenario():
+        errors = []
+        asyncio.get_running_loop().set_exception_handler(lambda loop, context: errors.append(context))
+        server = GameServer(port=0, tick_rate=240)
+        await server.start()
+        try:
+            reader, writer = await asyncio.open_connection("127.0.0.1", server.port)
+            writer.write(frame(JOIN.pack(MSG_JOIN, 5, 1)))
+            writer.write(frame(b""))
+            await writer.drain()
+            # The server drops the connection instead of raising
+            while await reader.read(1024):
+                pass
+            writer.close()
+
+            client = GameClient()
+            await client.connect(port=server.port, match_id=6, vs_ai=True)
+            await wait_for(lambda: client.tick > 10)
+            await client.close()
+        finally:
+            await server.stop()
+        assert errors == []
+
+    asyncio.run(scenario())
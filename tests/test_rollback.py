@@ -0,0 +1,113 @@
+import asyncio
+import random
+from game.constants import ROLLBACK_WINDOW
+from game.net import GameServer, GameClient
+from game.rollback import RollbackSession
+
+
+def exchange(latency, target=600, jitter=2, seed=5):
+    """
+    Play two peers against each other up to tick target, delivering every
+    input latency to latency + jitter frames after it was sent
+    """
+    peers = (RollbackSession(1, seed), RollbackSession(2, seed))
+    rng = random.Random(latency)
+    moves = [0, 0]
+    wire = []
+    sent = 0
+
+    now = 0
+    while wire or any(peer.tick < target for peer in peers):
+        for index, peer in enumerate(peers):
+            if rng.random() < 0.05:
+                moves[index] = rng.choice((-1, 0, 1))
+            scheduled = peer.add_local_input(moves[index])
+            if scheduled is not None:
+                sent += 1
+                wire.append((now + latency + rng.randint(0, jitter), peers[1 - index], scheduled))
+        for item in [item for item in wire if item[0] <= now]:
+            wire.remove(item)
+            item[1].add_remote_input(*item[2])
+        for peer in peers:
+            if peer.tick < target:
+                peer.advance()
+        now += 1
+
+    # Every input is delivered now: apply pending rollbacks and simulate target
+    for peer in peers:
+        peer.advance()
+    return peers, sent
+
+
+def test_peers_stay_identical():
+    for latency in (0, 3, 6, 12):
+        (first, second), sent = exchange(latency)
+        assert first.tick == second.tick
+        assert first.match.save_state() == second.match.save_state()
+        # Each tick's input is sent once, however long a peer stalled
+        assert sent == first.tick + second.tick
+        assert first.rollback_depth.max <= ROLLBACK_WINDOW
+        if latency > first.input_delay:
+            assert first.rollbacks > 0
+        if latency > first.input_delay + ROLLBACK_WINDOW:
+            assert first.stalls > 0
+
+
+def test_stalled_session_sends_nothing_new():
+    session = RollbackSession(1, seed=1)
+    assert session.add_local_input(1) == (session.input_delay, 1)
+    assert session.add_local_input(-1) is None
+    for _ in range(ROLLBACK_WINDOW + 5):
+        session.advance()
+        session.add_local_input(0)
+    stalled_tick = session.tick
+    assert session.stalls > 0
+    assert session.add_local_input(1) is None
+    assert session.tick == stalled_tick
+
+
+def test_rollback_match_over_loopback_with_late_joiner():
+    target = 200
+
+    async def peer(port, rng, start_delay):
+        await asyncio.sleep(start_delay)
+        client = GameClient()
+        await client.connect(port=port, match_id=7, rollback=True)
+        session = RollbackSession(client.player, client.seed)
+        client.on_peer_input = session.add_remote_input
+
+        def step(move):
+            scheduled = session.add_local_input(move)
+            if scheduled is not None:
+                client.send_input(*scheduled)
+            session.advance()
+
+        while session.tick < target:
+            step(rng.choice((-1, 0, 1)))
+            await asyncio.sleep(0.002)
+        # Once every remote input up to target is known, one more advance
+        # applies any pending rollback and simulates target with real inputs
+        while session.confirmed < target:
+            await asyncio.sleep(0.002)
+        step(0)
+        return client, session
+
+    async def scenario():
+        server = GameServer(port=0)
+        await server.start()
+        try:
+            (first, a), (second, b) = await asyncio.gather(
+                peer(server.port, random.Random(1), 0.0),
+                peer(server.port, random.Random(2), 0.2))
+            assert first.seed == second.seed
+            # The early peer stalled while alone and its inputs waited on the server
+            assert a.stalls > 0
+            assert server.matches[7].pending == {1: [], 2: []}
+            assert a.tick == b.tick == target + 1
+            assert a.match.save_state() == b.match.save_state()
+            await first.close()
+            await second.close()
+        finally:
+            await server.stop()
+
+    asyncio.run(scenario())